@@ -10,17 +10,27 @@ Checks if everything is running properly.
 For Claude to use silently - only show results if there's a problem.
 """
 
+import json
+import logging
 import subprocess
 import sys
+import time
 from pathlib import Path
 
 import click
 import httpx
 import paramiko
-from rich.console import Console
+from rich.console import Console, Group
 from rich.table import Table
+from rich.text import Text
 
 console = Console()
+logger = logging.getLogger(__name__)
+
+# Successful results are reused for a few seconds: tight polling loops rarely see
+# the deployment change that fast, and a cache hit skips ping, SSH and HTTP entirely.
+STATUS_CACHE_FILE = Path.home() / ".cache" / "scaleway-deploy" / "status.json"
+STATUS_CACHE_TTL_SECONDS = 3
 
 
 def get_server_ip() -> str | None:
@@ -33,7 +43,6 @@ def get_server_ip() -> str | None:
             text=True,
             check=True,
         )
-        import json
         secrets = json.loads(result.stdout)
         secret_names = [s["name"] for s in secrets]
 
@@ -44,7 +53,8 @@ def get_server_ip() -> str | None:
                 return cache_file.read_text().strip()
 
         return None
-    except Exception:
+    except (subprocess.CalledProcessError, OSError, ValueError, KeyError):
+        # gh missing/failing, unreadable cache, or unexpected JSON: treat as unknown IP
         return None
 
 
@@ -66,53 +76,59 @@ def check_server_reachable(ip: str) -> bool:
             timeout=5,
         )
         return result.returncode == 0
-    except Exception:
+    except (subprocess.TimeoutExpired, OSError):
         return False
 
 
-def check_ssh_access(ip: str, key_path: str | None) -> bool:
-    """Check if SSH access works."""
-    try:
-        client = paramiko.SSHClient()
-        client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-
-        connect_kwargs = {"hostname": ip, "username": "root", "timeout": 10}
-        if key_path:
-            connect_kwargs["key_filename"] = key_path
-        else:
-            # Try default keys
-            default_key = Path.home() / ".ssh" / "id_ed25519"
-            if default_key.exists():
-                connect_kwargs["key_filename"] = str(default_key)
-
-        client.connect(**connect_kwargs)
-        client.close()
-        return True
-    except Exception:
-        return False
+def ssh_connect(ip: str, key_path: str | None) -> paramiko.SSHClient:
+    """Create SSH connection to the server."""
+    client = paramiko.SSHClient()
+    client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
 
+    connect_kwargs = {"hostname": ip, "username": "root", "timeout": 10}
+    if key_path:
+        connect_kwargs["key_filename"] = key_path
+    else:
+        # Try default keys
+        default_key = Path.home() / ".ssh" / "id_ed25519"
+        if default_key.exists():
+            connect_kwargs["key_filename"] = str(default_key)
 
-def check_docker_running(ip: str, key_path: str | None) -> tuple[bool, list[str]]:
-    """Check if Docker containers are running."""
-    try:
-        client = paramiko.SSHClient()
-        client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+    client.connect(**connect_kwargs)
+    return client
 
-        connect_kwargs = {"hostname": ip, "username": "root", "timeout": 10}
-        if key_path:
-            connect_kwargs["key_filename"] = key_path
 
-        client.connect(**connect_kwargs)
-        stdin, stdout, stderr = client.exec_command("docker ps --format '{{.Names}}: {{.Status}}'")
-        output = stdout.read().decode().strip()
-        client.close()
+def check_ssh_access(ip: str, key_path: str | None) -> paramiko.SSHClient | None:
+    """Check if SSH access works.
 
-        if output:
-            containers = output.split("\n")
-            return True, containers
-        return True, []
-    except Exception as e:
-        return False, [str(e)]
+    Returns the connected client (or None on failure) so remote checks can open
+    channels on the same transport instead of paying for a second handshake.
+    """
+    try:
+        return ssh_connect(ip, key_path)
+    except (paramiko.SSHException, OSError):
+        # Only expected connection failures (socket.timeout is an OSError subclass);
+        # a broad catch would also hide real bugs
+        return None
+
+
+def check_docker_running(client: paramiko.SSHClient) -> tuple[bool, list[str]]:
+    """Check if Docker containers are running."""
+    try:
+        # exec_command opens a new channel on the existing transport
+        # LANG=C skips remote locale setup; docker output is ASCII anyway
+        stdin, stdout, stderr = client.exec_command("LANG=C docker ps --format '{{.Names}}: {{.Status}}'")
+        # Bound each read so a stalled channel can't hang the whole status check
+        stdout.channel.settimeout(5)
+        # Consume line by line instead of blocking on read() until EOF
+        containers = [line.strip() for line in iter(stdout.readline, "") if line.strip()]
+
+        return True, containers
+    except (paramiko.SSHException, OSError) as exc:
+        # Kept out of user output, which already reports the failure in the
+        # "Docker Running" row; the cause is only logged for debugging
+        logger.debug("docker ps over SSH failed: %s", exc)
+        return False, []
 
 
 def check_app_health(ip: str, port: int = 8000) -> bool:
@@ -121,10 +137,50 @@ def check_app_health(ip: str, port: int = 8000) -> bool:
         with httpx.Client(timeout=10) as client:
             response = client.get(f"http://{ip}:{port}/health")
             return response.status_code == 200
-    except Exception:
+    except (httpx.HTTPError, httpx.InvalidURL):
+        # InvalidURL (malformed ip/port) is not an HTTPError; it must report unhealthy, not crash
         return False
 
 
+def read_status_cache(ip: str, port: int) -> dict | None:
+    """Return cached successful results for ip:port if younger than the TTL, else None."""
+    try:
+        if time.time() - STATUS_CACHE_FILE.stat().st_mtime >= STATUS_CACHE_TTL_SECONDS:
+            return None
+        cached = json.loads(STATUS_CACHE_FILE.read_text())
+    except (OSError, ValueError):
+        return None
+    # Valid JSON of the wrong shape (hand-edited or truncated by another writer) is a miss
+    if not isinstance(cached, dict):
+        return None
+    if cached.get("ip") != ip or cached.get("port") != port:
+        return None
+    checks = cached.get("checks")
+    return checks if isinstance(checks, dict) else None
+
+
+def write_status_cache(ip: str, port: int, results: dict) -> None:
+    """Persist successful results; a failed write only costs the next poll a full check."""
+    try:
+        STATUS_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        STATUS_CACHE_FILE.write_text(json.dumps({"ip": ip, "port": port, "checks": results}))
+    except OSError:
+        pass
+
+
+def print_plain(
+    ip: str, port: int, checks: list[tuple[str, bool]], containers: list[str], all_ok: bool
+) -> None:
+    """Print check results as plain text (used when stdout is not a terminal)."""
+    lines = [f"Status: {ip}"]
+    lines.extend(f"{name}: {'OK' if ok else 'FAIL'}" for name, ok in checks)
+    if containers:
+        lines.append("Containers:")
+        lines.extend(f"  {c}" for c in containers)
+    lines.append(f"Everything is running! http://{ip}:{port}" if all_ok else "Some checks failed.")
+    click.echo("\n".join(lines))
+
+
 @click.command()
 @click.option("--ip", help="Server IP (auto-detected if not provided)")
 @click.option("--port", default=8000, help="App port")
@@ -146,15 +202,27 @@ def main(ip: str | None, port: int, quiet: bool, json_output: bool):
             console.print("[red]Server IP not found. Run setup first.[/red]")
         sys.exit(1)
 
+    if quiet or json_output:
+        cached = read_status_cache(ip, port)
+        if cached is not None:
+            if json_output:
+                print(json.dumps({"status": "ok", "checks": cached}))
+            sys.exit(0)
+
     key_path = get_ssh_key()
     results = {}
 
     # Run checks
     results["server_reachable"] = check_server_reachable(ip)
-    results["ssh_access"] = check_ssh_access(ip, key_path) if results["server_reachable"] else False
-
-    if results["ssh_access"]:
-        docker_ok, containers = check_docker_running(ip, key_path)
+    ssh_client = check_ssh_access(ip, key_path) if results["server_reachable"] else None
+    results["ssh_access"] = ssh_client is not None
+
+    if ssh_client is not None:
+        # One SSH session serves every remote check
+        try:
+            docker_ok, containers = check_docker_running(ssh_client)
+        finally:
+            ssh_client.close()
         results["docker_running"] = docker_ok
         results["containers"] = containers
     else:
@@ -171,19 +239,17 @@ def main(ip: str | None, port: int, quiet: bool, json_output: bool):
         results["app_healthy"],
     ])
 
+    if all_ok:
+        # Only successes are cached so a real failure is never masked
+        write_status_cache(ip, port, results)
+
     if json_output:
-        import json
         print(json.dumps({"status": "ok" if all_ok else "error", "checks": results}))
         sys.exit(0 if all_ok else 1)
 
     if quiet and all_ok:
         sys.exit(0)
 
-    # Display results
-    table = Table(title=f"Status: {ip}")
-    table.add_column("Check", style="cyan")
-    table.add_column("Status")
-
     checks = [
         ("Server Reachable", results["server_reachable"]),
         ("SSH Access", results["ssh_access"]),
@@ -191,21 +257,32 @@ def main(ip: str | None, port: int, quiet: bool, json_output: bool):
         ("App Healthy", results["app_healthy"]),
     ]
 
+    if not console.is_terminal:
+        # Piped/captured output: skip Rich's table measuring and ANSI rendering entirely
+        print_plain(ip, port, checks, results["containers"], all_ok)
+        sys.exit(0 if all_ok else 1)
+
+    # Display results
+    table = Table(title=f"Status: {ip}")
+    table.add_column("Check", style="cyan")
+    table.add_column("Status")
+
     for name, ok in checks:
         status = "[green]✓ OK[/green]" if ok else "[red]✗ FAIL[/red]"
         table.add_row(name, status)
 
-    console.print(table)
-
+    # Collect every renderable and print once: a single render pass and flush
+    renderables = [table]
     if results.get("containers"):
-        console.print("\n[bold]Containers:[/bold]")
-        for c in results["containers"]:
-            console.print(f"  {c}")
+        renderables.append(Text("\nContainers:", style="bold"))
+        renderables.extend(Text(f"  {c}") for c in results["containers"])
 
     if all_ok:
-        console.print(f"\n[green]Everything is running![/green] http://{ip}:{port}")
+        renderables.append(Text.from_markup(f"\n[green]Everything is running![/green] http://{ip}:{port}"))
     else:
-        console.print("\n[red]Some checks failed.[/red]")
+        renderables.append(Text("\nSome checks failed.", style="red"))
+
+    console.print(Group(*renderables))
 
     sys.exit(0 if all_ok else 1)
 
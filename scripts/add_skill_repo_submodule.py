@@ -22,12 +22,17 @@ this script; set CLAUDINE_REPO or use --repo-root to target a different repo.
 
 from __future__ import annotations
 
+import json
 import logging
 import os
 import re
 import shutil
+import stat
 import subprocess
 import sys
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache
 from pathlib import Path
 
 import click  # pyright: ignore[reportMissingImports]
@@ -38,35 +43,49 @@ SKILLS_DIR = ".claude/skills"
 AGENTS_DIR = ".claude/agents"
 AGENT_SOURCE_DIRS = ("agents", "subagents", ".claude/agents", ".claude/subagents")
 ENV_REPO_ROOT = "CLAUDINE_REPO"
+# https://github.com/<org>/<repo>/tree/<branch>/<subpath>, compiled once at import
+_GITHUB_TREE_URL_RE = re.compile(r"^(https://github\.com/[^/]+/[^/]+)/tree/([^/]+)/(.+)$")
+# [submodule "<name>"] section header in .gitmodules
+_GITMODULES_SECTION_RE = re.compile(r'^\[submodule\s+"(.*)"\]$')
+# Concurrent stat/scandir calls during skill discovery; enough to cover storage latency
+_SCAN_WORKERS = 8
+# VCS/tooling directories that never hold skills but can dwarf the real content
+_SKIP_DIRS = frozenset(
+    {".git", "node_modules", ".venv", "venv", "__pycache__", ".mypy_cache", ".pytest_cache", ".tox"}
+)
+# Bumped whenever discovery rules change, so results cached for the same commit by an
+# older version of this script (e.g. before symlinks were followed) are not reused
+_SKILL_CACHE_VERSION = 3
+# Script lives at <repo>/scripts/add_skill_repo_submodule.py -> repo is parent of scripts/.
+# Resolved once at import since __file__ never changes during the process.
+_SCRIPT_REPO_ROOT = Path(__file__).resolve().parent.parent
 
 logger = logging.getLogger(__name__)
 
 
 def _default_repo_root() -> Path:
     """Repo root: CLAUDINE_REPO if set, else the repo that contains this script."""
-    env = os.environ.get(ENV_REPO_ROOT, "").strip()
+    return _repo_root_for_env(os.environ.get(ENV_REPO_ROOT, "").strip())
+
+
+@cache
+def _repo_root_for_env(env: str) -> Path:
+    """Memoized body of _default_repo_root, keyed on the env value so changes are still seen."""
     if env:
         return Path(env).expanduser()
-    # Script lives at <repo>/scripts/add_skill_repo_submodule.py -> repo is parent of scripts/
-    return Path(__file__).resolve().parent.parent
+    return _SCRIPT_REPO_ROOT
 
 
 def repo_name_from_url(url: str) -> str | None:
     """Derive repo name from a Git URL by taking the last path segment and stripping .git."""
-    if not url or not url.strip():
-        return None
-    url = url.strip()
     # Normalize: remove .git suffix and trailing slash, then take last segment
-    base = url.rstrip("/").removesuffix(".git")
-    if not base:
-        return None
-    # Last path segment (handles both git@host:org/repo and https://host/org/repo)
-    last = base.split("/")[-1] if "/" in base else base
-    # git@host:repo (no slash) -> use as-is
-    if ":" in last:
-        last = last.split(":")[-1]
-    # Must be a valid directory name (non-empty, no path separators)
-    if not last or "/" in last or "\\" in last:
+    base = url.strip().rstrip("/").removesuffix(".git")
+    # Last path segment (handles both git@host:org/repo and https://host/org/repo), then
+    # what follows the host in git@host:repo; rpartition returns the whole string when the
+    # separator is absent, so every URL takes the same straight-line path
+    last = base.rpartition("/")[2].rpartition(":")[2]
+    # Must be a valid directory name (non-empty, no path separators; "/" is already gone)
+    if not last or "\\" in last:
         return None
     return last
 
@@ -79,32 +98,165 @@ def parse_github_tree_url(url: str) -> tuple[str, str, str] | None:
     Example: https://github.com/org/repo/tree/main/some/path
     -> ("https://github.com/org/repo", "main", "some/path")
     """
-    m = re.match(r"^(https://github\.com/[^/]+/[^/]+)/tree/([^/]+)/(.+)$", url.strip())
+    url = url.strip()
+    # Cheap prefix reject so ssh and non-GitHub URLs never reach the regex
+    if not url.startswith("https://github.com/"):
+        return None
+    m = _GITHUB_TREE_URL_RE.match(url)
     if m:
         return m.group(1), m.group(2), m.group(3)
     return None
 
 
-def skill_folders_recursive(root: Path) -> list[Path]:
-    """Return all directories under root (any depth) that contain SKILL.md."""
-    if not root.is_dir():
+def _has_skill_md(dir_path: str) -> bool:
+    """Return True if dir_path contains a SKILL.md regular file (one stat, no Path objects)."""
+    try:
+        return stat.S_ISREG(os.stat(os.path.join(dir_path, SKILL_FILENAME)).st_mode)
+    except OSError:
+        return False
+
+
+def _list_subdirs(dir_path: str) -> list[tuple[str, bool]]:
+    """Return (path, is_symlink) for each subdirectory of dir_path; unreadable dirs yield none."""
+    try:
+        with os.scandir(dir_path) as it:
+            # DirEntry caches the file type from getdents, so no extra stat per entry;
+            # the name check comes first so skipped trees cost nothing at all
+            return [
+                (entry.path, entry.is_symlink())
+                for entry in it
+                if entry.name not in _SKIP_DIRS and entry.is_dir()
+            ]
+    except OSError:
         return []
-    out: list[Path] = []
-    if (root / SKILL_FILENAME).is_file():
-        out.append(root)
-    for p in root.rglob("*"):
-        if p.is_dir() and (p / SKILL_FILENAME).is_file():
-            out.append(p)
-    return sorted(out, key=lambda x: (len(x.parts), x))
 
 
-def minimal_skill_dirs(dirs: list[Path], submodule_root: Path) -> list[Path]:
-    """Keep only dirs that have no ancestor in dirs, so one symlink covers nested skills."""
-    return [
-        d
-        for d in dirs
-        if not any(a != d and d.is_relative_to(a) for a in dirs)
-    ]
+def _is_within(path: str, root: str) -> bool:
+    """True if path is root itself or lies below it (both already resolved)."""
+    return path == root or path.startswith(root + os.sep)
+
+
+def _scandir_skill_dirs(root: str) -> Iterator[str]:
+    """
+    Yield skill directories at or below root, stopping descent at each SKILL.md.
+
+    A skill directory's subtree can only hold nested skills, which the single symlink to
+    the outer skill already covers, so it is never scanned. Symlinked directories are
+    only used when they resolve inside root: a submodule must not pull in skills from
+    elsewhere on disk. Such a link is followed once per target, and never when the target
+    contains the link itself, which would loop forever.
+
+    The tree is walked level by level and each level's SKILL.md probes and scandir calls
+    run on a thread pool: they are pure syscalls that release the GIL, so on a cold cache
+    or network filesystem their latencies overlap instead of adding up.
+    """
+    root_real = os.path.realpath(root)
+    followed_links: set[str] = set()
+    with ThreadPoolExecutor(max_workers=_SCAN_WORKERS) as pool:
+        level: list[tuple[str, bool]] = [(root, False)]
+        while level:
+            # Resolve links before probing them, dropping those that escape root
+            candidates = []
+            for dir_path, is_symlink in level:
+                if not is_symlink:
+                    candidates.append((dir_path, None))
+                    continue
+                link_real = os.path.realpath(dir_path)
+                if _is_within(link_real, root_real):
+                    candidates.append((dir_path, link_real))
+            to_descend: list[str] = []
+            is_skill = pool.map(_has_skill_md, [dir_path for dir_path, _ in candidates])
+            for (dir_path, link_real), has_skill in zip(candidates, is_skill):
+                if has_skill:
+                    yield dir_path
+                elif link_real is None:
+                    to_descend.append(dir_path)
+                elif link_real not in followed_links and not _is_within(
+                    os.path.realpath(os.path.dirname(dir_path)), link_real
+                ):
+                    followed_links.add(link_real)
+                    to_descend.append(dir_path)
+            level = [sub for subs in pool.map(_list_subdirs, to_descend) for sub in subs]
+
+
+def skill_folders_recursive(root: Path) -> list[Path]:
+    """
+    Return the topmost directories under root (any depth) that contain SKILL.md.
+
+    Directories nested inside a skill directory are not returned, and a skill reached
+    both directly and through a symlink inside root is returned once, under its
+    shallowest path.
+    """
+    # No is_dir() precheck: scanning a missing or non-directory root already yields nothing
+    # Work on plain strings during the walk and only build Path objects for the hits.
+    # Decorate each hit once with (depth, components) - the same order as sorting Paths on
+    # (len(parts), path) - so the sort compares plain tuples instead of calling a key per Path.
+    decorated = []
+    for p in _scandir_skill_dirs(os.fspath(root)):
+        parts = p.split(os.sep)
+        decorated.append((len(parts), parts, p))
+    decorated.sort()
+    seen: set[str] = set()
+    folders = []
+    for _, _, p in decorated:
+        real = os.path.realpath(p)
+        if real not in seen:
+            seen.add(real)
+            folders.append(Path(p))
+    return folders
+
+
+def _skill_cache_dir() -> Path:
+    """Directory holding cached skill discovery results (honours XDG_CACHE_HOME)."""
+    cache_home = os.environ.get("XDG_CACHE_HOME", "").strip()
+    return (Path(cache_home) if cache_home else Path.home() / ".cache") / "claudine" / "submodule_skills"
+
+
+def _submodule_head(submodule_path: Path) -> str | None:
+    """Return the HEAD commit SHA of the submodule checkout, or None if it cannot be read.
+
+    An empty or uninitialised submodule directory is not a work tree of its own, so git
+    would walk up and report the parent repo's HEAD; that SHA must never key the cache.
+    """
+    r = subprocess.run(
+        ["git", "-C", str(submodule_path), "rev-parse", "--show-toplevel", "HEAD"],
+        capture_output=True,
+        text=True,
+    )
+    if r.returncode != 0:
+        return None
+    toplevel, _, sha = r.stdout.strip().partition("\n")
+    if os.path.realpath(toplevel) != os.path.realpath(submodule_path):
+        return None
+    return sha.strip() or None
+
+
+def cached_skill_folders(submodule_path: Path, repo_name: str) -> list[Path]:
+    """
+    Return skill_folders_recursive(submodule_path), cached on disk per submodule commit.
+
+    A submodule tree only changes when its checked-out commit changes, so keying the cache
+    on HEAD makes --force re-runs skip the tree walk and invalidates itself on update.
+    """
+    sha = _submodule_head(submodule_path)
+    if sha is None:
+        return skill_folders_recursive(submodule_path)
+    cache_path = _skill_cache_dir() / f"{repo_name}-{sha}-v{_SKILL_CACHE_VERSION}.json"
+    try:
+        return [submodule_path / rel for rel in json.loads(cache_path.read_text())]
+    except (OSError, ValueError):
+        pass
+
+    folders = skill_folders_recursive(submodule_path)
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        # Write then rename so a concurrent run never reads a half-written file
+        tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps([f.relative_to(submodule_path).as_posix() for f in folders]))
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        logger.debug("Could not write skill discovery cache %s: %s", cache_path, e)
+    return folders
 
 
 def discover_agent_files(submodule_root: Path) -> list[tuple[Path, Path]]:
@@ -133,15 +285,66 @@ def discover_agent_files(submodule_root: Path) -> list[tuple[Path, Path]]:
 
 def add_submodule(repo_root: Path, url: str, submodule_path: Path) -> None:
     """Run git submodule add; raises CalledProcessError on failure."""
+    # Only the current tree is needed to discover skills, so fetch a single commit.
+    # protocol v2 lets the server skip advertising every ref (default only on newer git).
     subprocess.run(
-        ["git", "submodule", "add", url, str(submodule_path)],
+        ["git", "-c", "protocol.version=2", "submodule", "add", "--depth", "1", "--", url, str(submodule_path)],
         cwd=repo_root,
         check=True,
         capture_output=True,
-        text=True,
     )
 
 
+def _path_exists(path: Path) -> bool:
+    """True if anything (including a broken symlink) exists at path, using a single lstat."""
+    try:
+        os.lstat(path)
+    except (FileNotFoundError, NotADirectoryError):
+        return False
+    return True
+
+
+def _stderr_text(e: subprocess.CalledProcessError) -> str:
+    """Decode captured stderr for logging; git output is kept as bytes until it is shown."""
+    if e.stderr:
+        return e.stderr.decode("utf-8", errors="replace").strip()
+    return str(e)
+
+
+def _remove_dir(path: Path) -> None:
+    """Remove a directory tree; an empty directory (the usual leftover) costs one rmdir."""
+    try:
+        os.rmdir(path)
+    except OSError:
+        # Not empty (or rmdir refused): fall back to the full tree removal
+        shutil.rmtree(path)
+
+
+def gitmodules_has_url(gitmodules: Path, name: str) -> bool:
+    """Return True if the .gitmodules file declares a non-empty url for submodule name."""
+    if not gitmodules.is_file():
+        return False
+    section: str | None = None
+    for raw_line in gitmodules.read_text(encoding="utf-8").splitlines():
+        line = raw_line.strip()
+        if line.startswith("["):
+            m = _GITMODULES_SECTION_RE.match(line)
+            section = m.group(1) if m else None
+        elif section == name:
+            key, _, value = line.partition("=")
+            if key.strip().lower() == "url" and value.strip():
+                return True
+    return False
+
+
+def append_gitmodules_entry(gitmodules: Path, name: str, url: str) -> None:
+    """Append a [submodule] section in git's own layout, leaving existing entries untouched."""
+    existing = gitmodules.read_text(encoding="utf-8") if gitmodules.is_file() else ""
+    separator = "\n" if existing and not existing.endswith("\n") else ""
+    with gitmodules.open("a", encoding="utf-8") as f:
+        f.write(f'{separator}[submodule "{name}"]\n\tpath = {name}\n\turl = {url}\n')
+
+
 def ensure_dir(path: Path) -> None:
     """Create directory and parents if they do not exist."""
     path.mkdir(parents=True, exist_ok=True)
@@ -174,12 +377,12 @@ def _prompt_collision(skill_name: str, link_path: Path, repo_name: str) -> str:
 def _unique_skill_link_path(skills_dir: Path, base_name: str, repo_name: str) -> Path:
     """Return a path under skills_dir for a skill name that does not yet exist (for keep_both)."""
     candidate = skills_dir / f"{base_name}-{repo_name}"
-    if not candidate.exists() and not candidate.is_symlink():
+    if not _path_exists(candidate):
         return candidate
     n = 2
     while True:
         candidate = skills_dir / f"{base_name}-{repo_name}-{n}"
-        if not candidate.exists() and not candidate.is_symlink():
+        if not _path_exists(candidate):
             return candidate
         n += 1
 
@@ -191,13 +394,13 @@ def _unique_agent_link_path(base_target_path: Path, repo_name: str) -> Path:
     parent = base_target_path.parent
 
     candidate = parent / f"{stem}-{repo_name}{suffix}"
-    if not candidate.exists() and not candidate.is_symlink():
+    if not _path_exists(candidate):
         return candidate
 
     n = 2
     while True:
         candidate = parent / f"{stem}-{repo_name}-{n}{suffix}"
-        if not candidate.exists() and not candidate.is_symlink():
+        if not _path_exists(candidate):
             return candidate
         n += 1
 
@@ -244,39 +447,56 @@ def _scaffold_skill_from_subpath(
     Optionally launches a Claude agent to auto-generate SKILL.md from the references.
     """
     skill_dir = skills_dir / skill_name
-    if skill_dir.exists() and not force:
-        logger.error("Skill directory already exists: %s", skill_dir)
-        sys.exit(1)
-    skill_dir.mkdir(parents=True, exist_ok=True)
+    # Let mkdir/symlink report collisions (EEXIST) instead of stat-ing every path first:
+    # the happy path is one makedirs, one stat of the target and one symlink
+    try:
+        os.makedirs(skill_dir)
+    except FileExistsError:
+        if not force:
+            logger.error("Skill directory already exists: %s", skill_dir)
+            sys.exit(1)
 
-    # Resolve the target path inside the cloned submodule
-    target = submodule_path.resolve() / subpath
-    if not target.exists():
+    # Target path inside the cloned submodule. No realpath: run() derives submodule_path
+    # and skills_dir from the same resolved roots, so the lexical relpath below is exact
+    # and a symlinked submodule checkout is simply followed by the link.
+    target = os.path.join(submodule_path, subpath)
+    if not os.path.exists(target):
         logger.error("Subpath does not exist in submodule: %s", target)
         sys.exit(1)
 
     references_link = skill_dir / "references"
-    if references_link.exists() or references_link.is_symlink():
-        if not force:
-            logger.error("references link already exists: %s", references_link)
-            sys.exit(1)
-        if references_link.is_symlink():
-            references_link.unlink()
-        else:
-            shutil.rmtree(references_link)
-
     # Use a relative symlink so the skill directory remains portable
     try:
-        rel = Path(os.path.relpath(target, references_link.parent))
+        rel = os.path.relpath(target, skill_dir)
     except ValueError:
         rel = target
-    references_link.symlink_to(rel, target_is_directory=True)
+    try:
+        os.symlink(rel, references_link, target_is_directory=True)
+    except FileExistsError:
+        if not force:
+            logger.error("references link already exists: %s", references_link)
+            sys.exit(1)
+        if os.path.isdir(references_link) and not os.path.islink(references_link):
+            _remove_dir(references_link)
+        else:
+            os.unlink(references_link)
+        os.symlink(rel, references_link, target_is_directory=True)
     logger.info("Linked %s -> %s", references_link, rel)
 
     if run_skillgen:
         _run_claude_skillgen(skill_dir)
 
 
+@cache
+def _claude_bin() -> str:
+    """Absolute path of the claude CLI, looked up on PATH once per process.
+
+    Falls back to the bare name so a missing CLI still surfaces as FileNotFoundError
+    from subprocess.
+    """
+    return shutil.which("claude") or "claude"
+
+
 def _run_claude_skillgen(skill_dir: Path) -> None:
     """
     Launch the Claude CLI to auto-generate a SKILL.md in skill_dir.
@@ -295,7 +515,7 @@ def _run_claude_skillgen(skill_dir: Path) -> None:
         # No capture_output so the generation streams to the user's terminal
         # --dangerously-skip-permissions allows Claude to write files without prompting
         subprocess.run(
-            ["claude", "-p", prompt, "--dangerously-skip-permissions"],
+            [_claude_bin(), "-p", prompt, "--dangerously-skip-permissions"],
             cwd=skill_dir,
             check=True,
         )
@@ -347,60 +567,48 @@ def run(
         sys.exit(1)
 
     submodule_path = external_dir / name
-    submodule_already_exists = submodule_path.exists() or submodule_path.is_symlink()
+    submodule_already_exists = _path_exists(submodule_path)
 
     if submodule_already_exists and not force:
         logger.error("Submodule path already exists: %s", submodule_path)
         sys.exit(1)
 
     ensure_dir(external_dir)
+    # Resolve once as a string: realpath is a single C-level walk and both the
+    # .gitmodules key and the skill symlink targets below reuse it
+    submodule_real = os.path.realpath(submodule_path)
     if not submodule_already_exists:
         logger.info("Adding submodule %s at %s", actual_url, submodule_path)
         try:
             add_submodule(repo_root, actual_url, submodule_path)
         except subprocess.CalledProcessError as e:
-            logger.error("git submodule add failed: %s", e.stderr or e)
+            logger.error("git submodule add failed: %s", _stderr_text(e))
             sys.exit(1)
     else:
         logger.info("Submodule path already exists; updating and syncing symlinks (--force)")
-        submodule_rel = submodule_path.resolve().relative_to(repo_root.resolve())
-        submodule_rel_str = str(submodule_rel).replace("\\", "/")
-        # Ensure .gitmodules has an entry with relative path so "git submodule update" can find the url
+        # repo_root is already resolved by main(), so no second path walk is needed
+        submodule_rel_str = os.path.relpath(submodule_real, repo_root).replace("\\", "/")
+        # Ensure .gitmodules has an entry with relative path so "git submodule update" can find the url.
+        # .gitmodules is read and appended in-process rather than via three git config calls.
+        gitmodules = repo_root / ".gitmodules"
         try:
-            r = subprocess.run(
-                ["git", "config", "-f", ".gitmodules", "--get", f"submodule.{submodule_rel_str}.url"],
-                cwd=repo_root,
-                capture_output=True,
-                text=True,
-            )
-            if r.returncode != 0 or not r.stdout.strip():
-                subprocess.run(
-                    ["git", "config", "-f", ".gitmodules", f"submodule.{submodule_rel_str}.path", submodule_rel_str],
-                    cwd=repo_root,
-                    check=True,
-                    capture_output=True,
-                    text=True,
-                )
-                subprocess.run(
-                    ["git", "config", "-f", ".gitmodules", f"submodule.{submodule_rel_str}.url", actual_url],
-                    cwd=repo_root,
-                    check=True,
-                    capture_output=True,
-                    text=True,
-                )
-                subprocess.run(["git", "submodule", "sync", "--"], cwd=repo_root, check=True, capture_output=True, text=True)
+            if not gitmodules_has_url(gitmodules, submodule_rel_str):
+                append_gitmodules_entry(gitmodules, submodule_rel_str, actual_url)
+                subprocess.run(["git", "submodule", "sync", "--"], cwd=repo_root, check=True, capture_output=True)
+        except OSError as e:
+            logger.debug("Could not ensure .gitmodules entry: %s", e)
         except subprocess.CalledProcessError as e:
-            logger.debug("Could not ensure .gitmodules entry: %s", e.stderr or e)
+            logger.debug("Could not ensure .gitmodules entry: %s", _stderr_text(e))
         try:
             subprocess.run(
-                ["git", "submodule", "update", "--init", "--", str(submodule_path)],
+                # Shallow, single-branch fetch: history is never used here
+                ["git", "submodule", "update", "--init", "--depth", "1", "--single-branch", "--", str(submodule_path)],
                 cwd=repo_root,
                 check=True,
                 capture_output=True,
-                text=True,
             )
         except subprocess.CalledProcessError as e:
-            logger.warning("git submodule update failed: %s; continuing with existing tree", e.stderr or e)
+            logger.warning("git submodule update failed: %s; continuing with existing tree", _stderr_text(e))
 
     if sync_skills:
         ensure_dir(skills_dir)
@@ -416,27 +624,22 @@ def run(
             )
         else:
             # Plain repo URL path: discover SKILL.md folders and create flat symlinks
-            all_with_skill = skill_folders_recursive(submodule_path)
-            folders = minimal_skill_dirs(all_with_skill, submodule_path)
+            # The walk already stops at the outermost SKILL.md, so nested skills never appear
+            folders = cached_skill_folders(submodule_path, name)
             if not folders:
                 logger.info("No directories with %s found; no skill symlinks created", SKILL_FILENAME)
             else:
-                try:
-                    submodule_resolved = submodule_path.resolve()
-                except OSError as e:
-                    logger.error("Cannot resolve submodule path: %s", e)
-                    sys.exit(1)
-
-                # Flat layout: .claude/skills/<skill_name>/ for each skill (leaf name only)
-                for folder in sorted(folders, key=lambda p: len(p.parts)):
-                    if folder == submodule_path:
-                        skill_name = name
-                        target = submodule_resolved
-                    else:
-                        skill_name = folder.name
-                        target = submodule_resolved / folder.relative_to(submodule_path)
+                # Targets are joined as strings onto the already-resolved submodule path
+                # instead of building relative_to()/"/" Path objects per skill
+                submodule_depth = len(submodule_path.parts)
+
+                # Flat layout: .claude/skills/<skill_name>/ for each skill (leaf name only).
+                # folders is already ordered by depth (shallower skills claim names first).
+                for folder in folders:
+                    skill_name = name if folder == submodule_path else folder.name
+                    target = os.path.join(submodule_real, *folder.parts[submodule_depth:])
                     link_path = skills_dir / skill_name
-                    if link_path.exists() or link_path.is_symlink():
+                    if _path_exists(link_path):
                         if not force:
                             choice = _prompt_collision(skill_name, link_path, name)
                             if choice == "skip":
@@ -447,7 +650,7 @@ def run(
                                 if link_path.is_symlink():
                                     link_path.unlink()
                                 elif link_path.is_dir():
-                                    shutil.rmtree(link_path)
+                                    _remove_dir(link_path)
                                 else:
                                     logger.error("Skill target exists and is a file (not a dir/symlink): %s", link_path)
                                     sys.exit(1)
@@ -455,12 +658,12 @@ def run(
                             if link_path.is_symlink():
                                 link_path.unlink()
                             elif link_path.is_dir():
-                                shutil.rmtree(link_path)
+                                _remove_dir(link_path)
                             else:
                                 logger.error("Skill target exists and is a file (not a dir/symlink): %s", link_path)
                                 sys.exit(1)
                     try:
-                        rel = Path(os.path.relpath(target, link_path.parent))
+                        rel = os.path.relpath(target, os.path.dirname(link_path))
                     except ValueError:
                         rel = target
                     link_path.symlink_to(rel, target_is_directory=True)
@@ -478,7 +681,7 @@ def run(
             for source_file, rel_target in discovered_agents:
                 link_path = agents_dir / rel_target
                 link_path.parent.mkdir(parents=True, exist_ok=True)
-                if link_path.exists() or link_path.is_symlink():
+                if _path_exists(link_path):
                     if not force:
                         choice = _prompt_collision(rel_target.name, link_path, name)
                         if choice == "skip":
@@ -489,7 +692,7 @@ def run(
                             if link_path.is_symlink() or link_path.is_file():
                                 link_path.unlink()
                             elif link_path.is_dir():
-                                shutil.rmtree(link_path)
+                                _remove_dir(link_path)
                             else:
                                 logger.error("Agent target exists and cannot be replaced: %s", link_path)
                                 sys.exit(1)
@@ -497,14 +700,15 @@ def run(
                         if link_path.is_symlink() or link_path.is_file():
                             link_path.unlink()
                         elif link_path.is_dir():
-                            shutil.rmtree(link_path)
+                            _remove_dir(link_path)
                         else:
                             logger.error("Agent target exists and cannot be replaced: %s", link_path)
                             sys.exit(1)
+                source_real = os.path.realpath(source_file)
                 try:
-                    rel = Path(os.path.relpath(source_file.resolve(), link_path.parent))
+                    rel = Path(os.path.relpath(source_real, link_path.parent))
                 except ValueError:
-                    rel = source_file.resolve()
+                    rel = Path(source_real)
                 link_path.symlink_to(rel)
                 logger.info("Linked %s -> %s", link_path, rel)
 
@@ -10,11 +10,12 @@ by external tools, and this script ensures those changes are always committed
 and pushed without manual intervention.
 
 Workflow:
-  1. Stash local changes (if any)
-  2. Pull --rebase to sync with remote
-  3. Pop stash
-  4. If conflicts arise, invoke a Claude agent to resolve them
-  5. Commit and push
+  1. Fetch; if upstream has nothing new, commit and push local changes (if any) and stop
+  2. Stash local changes (if any)
+  3. Pull --rebase to sync with remote
+  4. Pop stash
+  5. If conflicts arise, invoke a Claude agent to resolve them
+  6. Commit and push
 """
 
 import logging
@@ -33,9 +34,21 @@ logging.basicConfig(
 logger = logging.getLogger("auto_commit")
 
 
-def run(cmd: list[str], **kwargs) -> subprocess.CompletedProcess:
-    """Run a command in the repo directory, logging it for traceability."""
+def run(cmd: list[str], discard_output: bool = False, **kwargs) -> subprocess.CompletedProcess:
+    """Run a command in the repo directory, logging it for traceability.
+
+    With discard_output, stdout/stderr go to /dev/null: nothing is piped or decoded
+    for commands whose output is never read.
+    """
     logger.debug("Running: %s", " ".join(cmd))
+    if discard_output:
+        return subprocess.run(
+            cmd,
+            cwd=REPO_DIR,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            **kwargs,
+        )
     result = subprocess.run(
         cmd,
         cwd=REPO_DIR,
@@ -50,29 +63,32 @@ def run(cmd: list[str], **kwargs) -> subprocess.CompletedProcess:
     return result
 
 
-def has_changes() -> bool:
-    """Check if the working tree has any uncommitted changes."""
-    # Refresh the index first (handles stat-only changes from symlinks)
-    run(["git", "update-index", "--refresh"])
-    result = run(["git", "status", "--porcelain"])
-    return bool(result.stdout.strip())
-
-
-def has_conflicts() -> bool:
-    """Check if the working tree has unresolved merge conflicts."""
-    result = run(["git", "diff", "--name-only", "--diff-filter=U"])
-    return bool(result.stdout.strip())
-
-
-def get_conflict_files() -> list[str]:
-    """Return the list of files with unresolved merge conflicts."""
-    result = run(["git", "diff", "--name-only", "--diff-filter=U"])
-    return [f for f in result.stdout.strip().splitlines() if f]
-
-
-def resolve_conflicts_with_claude() -> bool:
+def git_status() -> tuple[bool, list[str]]:
+    """Return (has_changes, conflict_files) for the working tree from a single git call.
+
+    Porcelain v2 tags unmerged entries with "u", so one status run answers both
+    questions instead of separate refresh/status/diff processes.
+    """
+    # -z keeps paths verbatim (no quoting) and NUL-separated. --no-renames skips rename
+    # detection, the costly part of status that plain change detection doesn't need;
+    # split plumbing (update-index + diff-index + ls-files) would cost three processes.
+    result = run(["git", "status", "--porcelain=v2", "-z", "--no-renames"])
+    changed = False
+    conflict_files: list[str] = []
+    # With --no-renames there are no "2" records, whose extra NUL-separated original path
+    # would otherwise need skipping: every record is a single field
+    for record in result.stdout.split("\0"):
+        if not record:
+            continue
+        changed = True
+        if record.startswith("u "):
+            # u <XY> <sub> <m1> <m2> <m3> <mW> <h1> <h2> <h3> <path>
+            conflict_files.append(record.split(" ", 10)[10])
+    return changed, conflict_files
+
+
+def resolve_conflicts_with_claude(conflict_files: list[str]) -> bool:
     """Invoke Claude Code in non-interactive mode to resolve merge conflicts."""
-    conflict_files = get_conflict_files()
     if not conflict_files:
         return True
 
@@ -119,7 +135,7 @@ def resolve_conflicts_with_claude() -> bool:
     logger.info("Claude agent output: %s", result.stdout.strip()[:500])
 
     # Verify no conflicts remain
-    if has_conflicts():
+    if git_status()[1]:
         logger.error("Conflicts remain after Claude agent resolution.")
         return False
 
@@ -146,6 +162,20 @@ def stash_local_changes() -> bool:
     return stashed
 
 
+def remote_has_changes() -> bool:
+    """Fetch and report whether upstream has commits missing from HEAD.
+
+    Returns True when this cannot be determined (fetch failure, no upstream) so the
+    caller falls back to a regular pull.
+    """
+    if run(["git", "fetch"]).returncode != 0:
+        return True
+    result = run(["git", "rev-list", "--count", "HEAD..@{u}"])
+    if result.returncode != 0:
+        return True
+    return result.stdout.strip() != "0"
+
+
 def pull_rebase() -> bool:
     """Pull with rebase from origin. Returns True on success."""
     result = run(["git", "pull", "--rebase", "--autostash"])
@@ -154,7 +184,7 @@ def pull_rebase() -> bool:
         # Abort the rebase to get back to a clean state
         if "rebase" in result.stderr.lower() or "conflict" in result.stderr.lower():
             logger.info("Aborting failed rebase...")
-            run(["git", "rebase", "--abort"])
+            run(["git", "rebase", "--abort"], discard_output=True)
         return False
     logger.info("Pulled and rebased successfully.")
     return True
@@ -207,7 +237,16 @@ def commit_and_push() -> int:
 
 def main() -> int:
     """Sync local changes with remote: stash, rebase, resolve, commit, push."""
-    local_changes = has_changes()
+    local_changes, _ = git_status()
+    if not remote_has_changes():
+        # The common periodic run has nothing to sync: skip the rebase machinery entirely
+        if not local_changes:
+            logger.info("No local or remote changes, nothing to sync.")
+            return 0
+        # Nothing to integrate from upstream, so stash/pull/pop would be three wasted
+        # git processes: commit and push directly
+        return commit_and_push()
+
     did_stash = False
 
     if local_changes:
@@ -225,21 +264,22 @@ def main() -> int:
     # Pop stash if we stashed
     if did_stash:
         stash_ok = pop_stash()
-        if not stash_ok and has_conflicts():
+        conflict_files = [] if stash_ok else git_status()[1]
+        if conflict_files:
             # Conflicts from stash pop — ask Claude to resolve
-            resolved = resolve_conflicts_with_claude()
+            resolved = resolve_conflicts_with_claude(conflict_files)
             if not resolved:
                 logger.error(
                     "Could not resolve conflicts. Dropping stash and keeping remote state."
                 )
                 # Reset to clean state, drop the conflicted stash application
-                run(["git", "checkout", "--", "."])
-                run(["git", "clean", "-fd"])
+                run(["git", "checkout", "--", "."], discard_output=True)
+                run(["git", "clean", "-fd"], discard_output=True)
                 # The stash is already applied (partially), drop it
-                run(["git", "stash", "drop"])
+                run(["git", "stash", "drop"], discard_output=True)
                 return 1
 
-    if not has_changes():
+    if not git_status()[0]:
         logger.info("No changes to commit after sync.")
         return 0
 
@@ -1,7 +1,7 @@
 #!/usr/bin/env -S uv run
 # /// script
 # requires-python = ">=3.11"
-# dependencies = ["click"]
+# dependencies = []
 # ///
 """
 Sync Claude/Codex skills and root files by creating symlinks from a source repo.
@@ -28,177 +28,336 @@ Examples:
 
 from __future__ import annotations
 
+import argparse
+import hashlib
 import os
+import shutil
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache
 from pathlib import Path
 
-import click
-
 DEFAULT_SOURCE = Path(os.environ.get("CLAUDINE_DIR", str(Path.home() / "Documents" / "claudine"))) / ".claude"
 TARGET_FOLDERS = [".claude", ".codex"]
 ROOT_FILES = ["CLAUDE.md", "AGENTS.md"]
 GITIGNORE_MARKER = "# skill_sync symlinks"
+# Upper bound on threads creating symlinks (symlink/unlink release the GIL)
+SYMLINK_WORKERS = 32
+
+
+@cache
+def _resolve_path(path: str) -> Path:
+    """Expand ~ and resolve path; cached so repeated runs in one process skip the walk."""
+    return Path(os.path.realpath(os.path.expanduser(path)))
+
+
+def _gitignore_stamp_file(target: Path) -> Path:
+    """Stamp recording the last synced .gitignore state of target (honours XDG_CACHE_HOME).
+
+    Kept in the user cache rather than next to the .gitignore so the target repo
+    never gets an extra untracked file.
+    """
+    cache_home = os.environ.get("XDG_CACHE_HOME", "").strip()
+    key = hashlib.sha256(os.fsencode(target)).hexdigest()[:16]
+    return (Path(cache_home) if cache_home else Path.home() / ".cache") / "claudine" / "skill_sync" / key
+
+
+def _gitignore_stamp(target: Path, entries: list[str]) -> str | None:
+    """Fingerprint of target/.gitignore (size, mtime) and the entries it must contain."""
+    try:
+        st = os.stat(target / ".gitignore")
+    except FileNotFoundError:
+        return None
+    digest = hashlib.sha256("\n".join(entries).encode()).hexdigest()
+    return f"{st.st_size}:{st.st_mtime_ns}:{digest}"
+
+
+def gitignore_up_to_date(target: Path, entries: list[str]) -> bool:
+    """Return True if .gitignore is unchanged since a sync that added these same entries."""
+    stamp = _gitignore_stamp(target, entries)
+    if stamp is None:
+        return False
+    try:
+        return _gitignore_stamp_file(target).read_text() == stamp
+    except OSError:
+        return False
+
+
+def record_gitignore_stamp(target: Path, entries: list[str]) -> None:
+    """Remember the current .gitignore state; a failed write only costs the next run a read."""
+    stamp = _gitignore_stamp(target, entries)
+    if stamp is None:
+        return
+    stamp_file = _gitignore_stamp_file(target)
+    try:
+        stamp_file.parent.mkdir(parents=True, exist_ok=True)
+        stamp_file.write_text(stamp)
+    except OSError:
+        pass
+
+
+def read_gitignore_lines(target: Path) -> set[str]:
+    """Return the lines of target/.gitignore as a set (empty if the file is missing)."""
+    try:
+        text = (target / ".gitignore").read_text()
+    except FileNotFoundError:
+        return set()
+    return set(text.splitlines())
 
 
 def update_gitignore(
     target: Path,
     entries: list[str],
+    existing_lines: set[str],
     dry_run: bool,
-) -> None:
-    """Append synced paths to .gitignore so symlinked items aren't committed."""
-    gitignore = target / ".gitignore"
+) -> list[str]:
+    """Append synced paths to .gitignore so symlinked items aren't committed.
 
-    existing_lines: set[str] = set()
-    if gitignore.exists():
-        existing_lines = set(gitignore.read_text().splitlines())
+    existing_lines comes from read_gitignore_lines and is kept in sync with what gets
+    appended, so the file is read once per run however often this is called.
+    Returns the status lines to report.
+    """
+    gitignore = target / ".gitignore"
 
     new_entries = [e for e in entries if e not in existing_lines]
     if not new_entries:
-        click.echo("  [skip] .gitignore (already up to date)")
-        return
+        return ["  [skip] .gitignore (already up to date)"]
 
     if dry_run:
-        for entry in new_entries:
-            click.echo(f"  [would add to .gitignore] {entry}")
-        return
-
-    with gitignore.open("a") as f:
-        # Add a section header on first use
-        if GITIGNORE_MARKER not in existing_lines:
-            f.write(f"\n{GITIGNORE_MARKER}\n")
-        for entry in new_entries:
-            f.write(f"{entry}\n")
-
-    for entry in new_entries:
-        click.echo(f"  [add to .gitignore] {entry}")
+        return [f"  [would add to .gitignore] {entry}" for entry in new_entries]
+
+    chunks: list[str] = []
+    # Add a section header on first use
+    if GITIGNORE_MARKER not in existing_lines:
+        chunks.append(f"\n{GITIGNORE_MARKER}\n")
+    chunks.extend(f"{entry}\n" for entry in new_entries)
+    # Raw append fd: one write(2) for the whole payload, no Python I/O stack
+    fd = os.open(gitignore, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, "".join(chunks).encode())
+    finally:
+        os.close(fd)
+    existing_lines.add(GITIGNORE_MARKER)
+    existing_lines.update(new_entries)
+
+    return [f"  [add to .gitignore] {entry}" for entry in new_entries]
+
+
+def scan_entries(folder: Path) -> dict[str, os.DirEntry]:
+    """Map entry names in folder to their DirEntry (empty if folder is missing).
+
+    One scandir per folder replaces a stat per target item: DirEntry answers
+    is_symlink/is_dir from the directory listing itself.
+    """
+    try:
+        with os.scandir(folder) as it:
+            return {entry.name: entry for entry in it}
+    except FileNotFoundError:
+        return {}
 
 
 def create_symlink(
-    source_item: Path,
-    target_item: Path,
+    source_item: str | os.PathLike[str],
+    target_item: str | os.PathLike[str],
+    existing: os.DirEntry | None,
     force: bool,
     dry_run: bool,
 ) -> str | None:
     """Create a symlink from target_item to source_item.
 
+    existing is target_item's entry from scan_entries, or None if it doesn't exist.
     Returns a status message or None if skipped.
     """
-    if target_item.exists() or target_item.is_symlink():
-        if target_item.is_symlink():
-            current_target = target_item.resolve()
-            if current_target == source_item.resolve():
-                return f"  [skip] {target_item.name} (already linked)"
+    source_item = os.fspath(source_item)
+    target_item = os.fspath(target_item)
+    name = os.path.basename(target_item)
+    if existing is not None:
+        if existing.is_symlink():
+            # Links we created compare equal on their text; only foreign (e.g. relative)
+            # links need the full resolve, compared against the resolved source since
+            # the source item may itself be a symlink
+            if (
+                os.readlink(target_item) == source_item
+                or os.path.realpath(target_item) == os.path.realpath(source_item)
+            ):
+                return f"  [skip] {name} (already linked)"
             if force:
                 if not dry_run:
-                    target_item.unlink()
-                return f"  [update] {target_item.name} -> {source_item}"
-            return f"  [skip] {target_item.name} (exists, use --force to overwrite)"
+                    os.unlink(target_item)
+                    os.symlink(source_item, target_item)
+                return f"  [update] {name} -> {source_item}"
+            return f"  [skip] {name} (exists, use --force to overwrite)"
         else:
             if force:
                 if not dry_run:
-                    if target_item.is_dir():
-                        import shutil
-
+                    if existing.is_dir(follow_symlinks=False):
                         shutil.rmtree(target_item)
                     else:
-                        target_item.unlink()
-                return f"  [replace] {target_item.name} -> {source_item}"
-            return f"  [skip] {target_item.name} (exists as real file/dir, use --force)"
+                        os.unlink(target_item)
+                    os.symlink(source_item, target_item)
+                return f"  [replace] {name} -> {source_item}"
+            return f"  [skip] {name} (exists as real file/dir, use --force)"
 
     if not dry_run:
-        target_item.symlink_to(source_item)
-    return f"  [link] {target_item.name} -> {source_item}"
-
-
-@click.command()
-@click.option(
-    "--source",
-    type=click.Path(exists=True, path_type=Path),
-    default=DEFAULT_SOURCE,
-    help=f"Source .claude folder (default: {DEFAULT_SOURCE})",
-)
-@click.option(
-    "--target",
-    type=click.Path(path_type=Path),
-    default=Path.cwd(),
-    help="Target directory (default: current working directory)",
-)
-@click.option(
-    "--force",
-    is_flag=True,
-    help="Overwrite existing symlinks",
-)
-@click.option(
-    "--dry-run",
-    is_flag=True,
-    help="Show what would be done without making changes",
-)
-def main(source: Path, target: Path, force: bool, dry_run: bool) -> None:
-    """Sync Claude/Codex skills by creating symlinks."""
-    source = source.expanduser().resolve()
-    target = target.expanduser().resolve()
+        os.symlink(source_item, target_item)
+    return f"  [link] {name} -> {source_item}"
 
-    if not source.exists():
-        click.echo(f"Error: Source folder does not exist: {source}", err=True)
-        sys.exit(1)
 
+def _write_lines(lines: list[str]) -> None:
+    """Write buffered status lines to stdout in a single call."""
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
+def _write_error(message: str) -> None:
+    """Report a fatal error on stderr, keeping stdout for status lines."""
+    sys.stderr.write(f"Error: {message}\n")
+
+
+def _sync(source: Path, target: Path, force: bool, dry_run: bool, out: list[str]) -> None:
+    """Link source items and root files into target, appending status lines to out."""
     if dry_run:
-        click.echo("[DRY RUN] No changes will be made\n")
+        out.append("[DRY RUN] No changes will be made\n")
 
-    click.echo(f"Source: {source}")
-    click.echo(f"Target: {target}\n")
+    out.append(f"Source: {source}")
+    out.append(f"Target: {target}\n")
 
     # Get items to symlink from source
-    source_items = sorted(source.iterdir())
+    # Sort the DirEntries on their names: no Path objects are built for the listing
+    with os.scandir(source) as it:
+        source_items = sorted(it, key=lambda entry: entry.name)
     if not source_items:
-        click.echo("No items found in source folder")
+        out.append("No items found in source folder")
         return
 
     # Collect gitignore entries as we create symlinks
     gitignore_entries: list[str] = []
 
+    # Prepare every target folder up front so a single pass over the source items
+    # can link each one into all of them
+    folders: list[tuple[str, str, dict[str, os.DirEntry], list[str]]] = []
     for folder_name in TARGET_FOLDERS:
         target_folder = target / folder_name
-        click.echo(f"Syncing to {target_folder}/")
+        header = [f"Syncing to {target_folder}/"]
 
-        # Create target folder if needed
+        # Create target folder if needed; a fresh folder is empty, so there is
+        # nothing to scan and every item goes straight to symlink creation
+        existing_entries: dict[str, os.DirEntry] = {}
         if not target_folder.exists():
             if not dry_run:
                 target_folder.mkdir(parents=True)
-            click.echo(f"  [create] {folder_name}/")
-
-        # Create symlinks for each item
-        for source_item in source_items:
-            target_item = target_folder / source_item.name
-            message = create_symlink(source_item, target_item, force, dry_run)
+            header.append(f"  [create] {folder_name}/")
+        else:
+            existing_entries = scan_entries(target_folder)
+        # Per-item targets are joined as plain strings: no Path object per item
+        folders.append((folder_name, os.fspath(target_folder), existing_entries, header))
+
+    def link_item(job: tuple[str, dict[str, os.DirEntry], os.DirEntry]) -> str | None:
+        target_folder_str, existing_entries, source_item = job
+        return create_symlink(
+            source_item,
+            os.path.join(target_folder_str, source_item.name),
+            existing_entries.get(source_item.name),
+            force,
+            dry_run,
+        )
+
+    # Jobs are item-major (each item against every folder); they are independent,
+    # so the syscalls overlap on a thread pool while map keeps the order
+    jobs = [
+        (target_folder_str, existing_entries, source_item)
+        for source_item in source_items
+        for _, target_folder_str, existing_entries, _ in folders
+    ]
+    with ThreadPoolExecutor(max_workers=min(SYMLINK_WORKERS, len(jobs))) as pool:
+        messages = list(pool.map(link_item, jobs))
+
+    # Report folder by folder: folder i's messages sit at every len(folders)-th job
+    for i, (folder_name, _, _, header) in enumerate(folders):
+        out.extend(header)
+        for source_item, message in zip(source_items, messages[i :: len(folders)]):
             if message:
-                click.echo(message)
+                out.append(message)
             # Track path relative to target for .gitignore
             gitignore_entries.append(f"{folder_name}/{source_item.name}")
-
-        click.echo()
+        out.append("")
 
     # Sync CLAUDE.md and AGENTS.md from source repo root to target
     source_root = source.parent
-    click.echo("Syncing root files to target/")
+    out.append("Syncing root files to target/")
+    target_entries = scan_entries(target)
     for name in ROOT_FILES:
         source_file = source_root / name
         if not source_file.is_file():
-            click.echo(f"  [skip] {name} (not found in source)")
+            out.append(f"  [skip] {name} (not found in source)")
             continue
         target_file = target / name
-        message = create_symlink(source_file, target_file, force, dry_run)
+        message = create_symlink(source_file, target_file, target_entries.get(name), force, dry_run)
         if message:
-            click.echo(message)
+            out.append(message)
         gitignore_entries.append(name)
-    click.echo()
+    out.append("")
 
     # Update .gitignore so symlinked items aren't committed to target repo
-    click.echo("Updating .gitignore")
-    update_gitignore(target, gitignore_entries, dry_run)
-    click.echo()
+    out.append("Updating .gitignore")
+    if gitignore_up_to_date(target, gitignore_entries):
+        # Steady state: a stat and a tiny stamp read instead of parsing the whole file
+        out.append("  [skip] .gitignore (unchanged since last sync)")
+    else:
+        out.extend(update_gitignore(target, gitignore_entries, read_gitignore_lines(target), dry_run))
+        if not dry_run:
+            record_gitignore_stamp(target, gitignore_entries)
+    out.append("")
+
+    out.append("Done!")
+
+
+def main() -> None:
+    """Sync Claude/Codex skills by creating symlinks."""
+    parser = argparse.ArgumentParser(
+        description="Sync Claude/Codex skills by creating symlinks",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__,
+    )
+    parser.add_argument(
+        "--source",
+        type=Path,
+        default=DEFAULT_SOURCE,
+        help=f"Source .claude folder (default: {DEFAULT_SOURCE})",
+    )
+    parser.add_argument(
+        "--target",
+        type=Path,
+        default=Path.cwd(),
+        help="Target directory (default: current working directory)",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Overwrite existing symlinks",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Show what would be done without making changes",
+    )
+
+    args = parser.parse_args()
+    force = args.force
+    dry_run = args.dry_run
+    source = _resolve_path(os.fspath(args.source))
+    target = _resolve_path(os.fspath(args.target))
+
+    if not source.exists():
+        _write_error(f"Source folder does not exist: {source}")
+        sys.exit(1)
 
-    click.echo("Done!")
+    # Status lines are buffered and written once at the end instead of one write per line;
+    # the finally still reports the actions that ran if a filesystem call raises part-way
+    out: list[str] = []
+    try:
+        _sync(source, target, force, dry_run, out)
+    finally:
+        _write_lines(out)
 
 
 if __name__ == "__main__":
@@ -2,35 +2,46 @@
 
 from __future__ import annotations
 
+import subprocess
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import pytest
 from click.testing import CliRunner
 
+from scripts import add_skill_repo_submodule as _mod_under_test
 from scripts.add_skill_repo_submodule import (
     ENV_REPO_ROOT,
     _default_repo_root,
     _run_claude_skillgen,
     _scaffold_skill_from_subpath,
+    _submodule_head,
+    append_gitmodules_entry,
+    cached_skill_folders,
     discover_agent_files,
+    gitmodules_has_url,
     main,
-    minimal_skill_dirs,
     parse_github_tree_url,
     repo_name_from_url,
     skill_folders_recursive,
 )
 
 SKILL_FILENAME = "SKILL.md"
+# Script lives at <repo>/scripts/, so the fallback root is two levels up from the module
+_EXPECTED_DEFAULT_ROOT = Path(_mod_under_test.__file__).resolve().parent.parent
+
+
+def _mk_skill(d: Path) -> Path:
+    """Create directory d (and parents) holding an empty SKILL.md; return d."""
+    d.mkdir(parents=True, exist_ok=True)
+    (d / SKILL_FILENAME).touch()
+    return d
 
 
 def test_default_repo_root_uses_script_repo_when_env_unset(monkeypatch: pytest.MonkeyPatch) -> None:
     """When CLAUDINE_REPO is not set, repo root is the directory containing the script (parent of scripts/)."""
-    import scripts.add_skill_repo_submodule as _mod
-
     monkeypatch.delenv(ENV_REPO_ROOT, raising=False)
-    expected = Path(_mod.__file__).resolve().parent.parent
-    assert _default_repo_root() == expected
+    assert _default_repo_root() == _EXPECTED_DEFAULT_ROOT
 
 
 def test_default_repo_root_uses_env_when_set(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
@@ -54,19 +65,10 @@ def test_repo_name_from_url_returns_last_segment(url: str, expected: str) -> Non
     assert repo_name_from_url(url) == expected
 
 
-def test_repo_name_from_url_empty_returns_none() -> None:
-    """Empty URL yields None."""
-    assert repo_name_from_url("") is None
-
-
-def test_repo_name_from_url_whitespace_only_returns_none() -> None:
-    """Whitespace-only URL yields None."""
-    assert repo_name_from_url("   ") is None
-
-
-def test_repo_name_from_url_dot_git_only_returns_none() -> None:
-    """URL that becomes empty after stripping .git yields None."""
-    assert repo_name_from_url(".git") is None
+@pytest.mark.parametrize("url", ["", "   ", ".git"], ids=["empty", "whitespace_only", "dot_git_only"])
+def test_repo_name_from_url_returns_none(url: str) -> None:
+    """Empty, whitespace-only, or .git-only URLs yield None."""
+    assert repo_name_from_url(url) is None
 
 
 def test_skill_folders_recursive_non_dir_returns_empty(tmp_path: Path) -> None:
@@ -89,25 +91,21 @@ def test_skill_folders_recursive_ignores_dir_without_skill_md(tmp_path: Path) ->
 
 def test_skill_folders_recursive_returns_one_folder_when_one_has_skill_md(tmp_path: Path) -> None:
     """One directory with SKILL.md yields a single result."""
-    d = tmp_path / "askill"
-    d.mkdir()
-    (d / SKILL_FILENAME).write_text("")
+    _mk_skill(tmp_path / "askill")
     result = skill_folders_recursive(tmp_path)
     assert len(result) == 1
 
 
 def test_skill_folders_recursive_returned_folder_has_expected_name(tmp_path: Path) -> None:
     """Returned folder name matches the directory that contains SKILL.md."""
-    d = tmp_path / "askill"
-    d.mkdir()
-    (d / SKILL_FILENAME).write_text("")
+    _mk_skill(tmp_path / "askill")
     result = skill_folders_recursive(tmp_path)
     assert result[0].name == "askill"
 
 
 def test_skill_folders_recursive_includes_root_when_root_has_skill_md(tmp_path: Path) -> None:
     """When root contains SKILL.md, root is included in results."""
-    (tmp_path / SKILL_FILENAME).write_text("")
+    _mk_skill(tmp_path)
     result = skill_folders_recursive(tmp_path)
     assert len(result) == 1
     assert result[0] == tmp_path
@@ -115,46 +113,158 @@ def test_skill_folders_recursive_includes_root_when_root_has_skill_md(tmp_path:
 
 def test_skill_folders_recursive_finds_nested_dir_with_skill_md(tmp_path: Path) -> None:
     """Directories with SKILL.md at any depth are found."""
-    (tmp_path / "foo" / "bar").mkdir(parents=True)
-    (tmp_path / "foo" / "bar" / SKILL_FILENAME).write_text("")
+    _mk_skill(tmp_path / "foo" / "bar")
     result = skill_folders_recursive(tmp_path)
     assert len(result) == 1
     assert result[0].name == "bar"
     assert result[0].parent.name == "foo"
 
 
+def test_skill_folders_recursive_skips_skills_nested_in_a_skill_dir(tmp_path: Path) -> None:
+    """A SKILL.md inside an already-found skill directory is not reported."""
+    foo = _mk_skill(tmp_path / "foo")
+    _mk_skill(foo / "bar")
+    assert skill_folders_recursive(tmp_path) == [foo]
+
+
+def test_skill_folders_recursive_skips_git_dir(tmp_path: Path) -> None:
+    """Tooling directories such as .git are never scanned for skills."""
+    _mk_skill(tmp_path / ".git" / "askill")
+    assert skill_folders_recursive(tmp_path) == []
+
+
+def test_skill_folders_recursive_follows_symlinked_dirs(tmp_path: Path) -> None:
+    """Skills reachable only through a symlinked directory are found via the link."""
+    # node_modules is never scanned itself, so the link is the only way in
+    askill = _mk_skill(tmp_path / "node_modules" / "pkg" / "askill")
+    (tmp_path / "link").symlink_to(askill.parent, target_is_directory=True)
+    assert skill_folders_recursive(tmp_path) == [tmp_path / "link" / "askill"]
+
+
+def test_skill_folders_recursive_ignores_symlink_escaping_root(tmp_path: Path) -> None:
+    """A symlinked directory resolving outside root is neither scanned nor returned."""
+    _mk_skill(tmp_path / "outside" / "askill")
+    root = tmp_path / "root"
+    root.mkdir()
+    (root / "link").symlink_to(tmp_path / "outside", target_is_directory=True)
+    (root / "skill-link").symlink_to(tmp_path / "outside" / "askill", target_is_directory=True)
+    assert skill_folders_recursive(root) == []
+
+
+def test_skill_folders_recursive_returns_aliased_skill_once(tmp_path: Path) -> None:
+    """A skill also reachable through an in-root symlink is listed once, under its shallowest path."""
+    _mk_skill(tmp_path / "shared" / "nested" / "askill")
+    (tmp_path / "alias").symlink_to(tmp_path / "shared" / "nested", target_is_directory=True)
+    assert skill_folders_recursive(tmp_path) == [tmp_path / "alias" / "askill"]
+
+
+def test_skill_folders_recursive_terminates_on_symlink_cycle(tmp_path: Path) -> None:
+    """A symlink pointing back at an ancestor is not followed."""
+    (tmp_path / "a").mkdir()
+    (tmp_path / "a" / "loop").symlink_to(tmp_path, target_is_directory=True)
+    assert skill_folders_recursive(tmp_path) == []
+
+
 def test_skill_folders_recursive_returns_sorted_by_depth_then_path(tmp_path: Path) -> None:
     """Returned list is sorted by path length then path."""
     for name in ("b", "a", "c"):
-        (tmp_path / name).mkdir()
-        (tmp_path / name / SKILL_FILENAME).write_text("")
+        _mk_skill(tmp_path / name)
     result = skill_folders_recursive(tmp_path)
     assert [p.name for p in result] == ["a", "b", "c"]
 
 
-def test_minimal_skill_dirs_keeps_only_topmost_when_nested(tmp_path: Path) -> None:
-    """When both parent and child have SKILL.md, only the parent is kept."""
-    (tmp_path / "foo").mkdir()
-    (tmp_path / "foo" / SKILL_FILENAME).write_text("")
-    (tmp_path / "foo" / "bar").mkdir()
-    (tmp_path / "foo" / "bar" / SKILL_FILENAME).write_text("")
-    all_dirs = skill_folders_recursive(tmp_path)
-    minimal = minimal_skill_dirs(all_dirs, tmp_path)
-    assert len(minimal) == 1
-    assert minimal[0].name == "foo"
+# ---------------------------------------------------------------------------
+# cached_skill_folders
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture
+def skill_submodule(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Submodule checkout with one skill, a pinned HEAD and an isolated cache dir."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    monkeypatch.setattr("scripts.add_skill_repo_submodule._submodule_head", lambda _path: "abc123")
+    submodule = tmp_path / "myrepo"
+    _mk_skill(submodule / "askill")
+    return submodule
+
+
+def test_cached_skill_folders_returns_walk_result_on_miss(skill_submodule: Path) -> None:
+    """A cold cache falls back to walking the submodule."""
+    assert cached_skill_folders(skill_submodule, "myrepo") == [skill_submodule / "askill"]
+
+
+def test_cached_skill_folders_reuses_result_for_same_head(skill_submodule: Path) -> None:
+    """A second call for the same HEAD is served from the cache without walking."""
+    cached_skill_folders(skill_submodule, "myrepo")
+    with patch("scripts.add_skill_repo_submodule.skill_folders_recursive") as stub_walk:
+        cached_skill_folders(skill_submodule, "myrepo")
+    stub_walk.assert_not_called()
+
+
+def _git(*args: str | Path) -> None:
+    """Run a git command quietly, failing the test on error."""
+    subprocess.run(["git", *map(str, args)], check=True, capture_output=True)
+
+
+@pytest.fixture
+def parent_repo(tmp_path: Path) -> Path:
+    """A git repo with one commit and an empty, uninitialised submodule-like directory."""
+    repo = tmp_path / "parent"
+    _git("init", "-q", repo)
+    _git("-C", repo, "-c", "user.name=t", "-c", "user.email=t@t", "commit", "-q", "--allow-empty", "-m", "init")
+    (repo / "external" / "empty").mkdir(parents=True)
+    return repo
+
+
+def test_submodule_head_ignores_parent_repo_for_empty_dir(parent_repo: Path) -> None:
+    """An empty submodule dir must not report the parent's HEAD (which would poison the cache)."""
+    assert _submodule_head(parent_repo / "external" / "empty") is None
+
+
+def test_submodule_head_returns_sha_of_own_work_tree(parent_repo: Path) -> None:
+    """A directory that is its own work tree reports its HEAD commit."""
+    expected = subprocess.run(
+        ["git", "-C", str(parent_repo), "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+    ).stdout.strip()
+    assert _submodule_head(parent_repo) == expected
 
 
-def test_minimal_skill_dirs_keeps_both_when_siblings(tmp_path: Path) -> None:
-    """When two sibling dirs have SKILL.md, both are kept."""
-    (tmp_path / "foo").mkdir()
-    (tmp_path / "foo" / SKILL_FILENAME).write_text("")
-    (tmp_path / "bar").mkdir()
-    (tmp_path / "bar" / SKILL_FILENAME).write_text("")
-    all_dirs = skill_folders_recursive(tmp_path)
-    minimal = minimal_skill_dirs(all_dirs, tmp_path)
-    assert len(minimal) == 2
-    names = {p.name for p in minimal}
-    assert names == {"foo", "bar"}
+def test_cached_skill_folders_cache_file_is_versioned(skill_submodule: Path, tmp_path: Path) -> None:
+    """Cache files carry a schema version so results from older discovery rules are not reused."""
+    cached_skill_folders(skill_submodule, "myrepo")
+    names = [p.name for p in (tmp_path / "cache" / "claudine" / "submodule_skills").iterdir()]
+    assert names == [f"myrepo-abc123-v{_mod_under_test._SKILL_CACHE_VERSION}.json"]
+
+
+# ---------------------------------------------------------------------------
+# .gitmodules helpers
+# ---------------------------------------------------------------------------
+
+GITMODULES = '[submodule "external/repo"]\n\tpath = external/repo\n\turl = https://github.com/org/repo\n'
+
+
+def test_gitmodules_has_url_finds_declared_submodule(tmp_path: Path) -> None:
+    """A submodule section with a url is detected."""
+    (tmp_path / ".gitmodules").write_text(GITMODULES)
+    assert gitmodules_has_url(tmp_path / ".gitmodules", "external/repo") is True
+
+
+def test_gitmodules_has_url_returns_false_for_other_submodule(tmp_path: Path) -> None:
+    """A url declared under another submodule name does not count."""
+    (tmp_path / ".gitmodules").write_text(GITMODULES)
+    assert gitmodules_has_url(tmp_path / ".gitmodules", "external/other") is False
+
+
+def test_gitmodules_has_url_returns_false_when_file_missing(tmp_path: Path) -> None:
+    """A missing .gitmodules declares nothing."""
+    assert gitmodules_has_url(tmp_path / ".gitmodules", "external/repo") is False
+
+
+def test_append_gitmodules_entry_is_found_afterwards(tmp_path: Path) -> None:
+    """An appended entry is visible to gitmodules_has_url."""
+    (tmp_path / ".gitmodules").write_text(GITMODULES.rstrip("\n"))
+    append_gitmodules_entry(tmp_path / ".gitmodules", "external/new", "https://github.com/org/new")
+    assert gitmodules_has_url(tmp_path / ".gitmodules", "external/new") is True
 
 
 # ---------------------------------------------------------------------------
@@ -222,29 +332,20 @@ def test_parse_github_tree_url_returns_subpath(url: str, expected_subpath: str)
     assert result[2] == expected_subpath
 
 
-def test_parse_github_tree_url_returns_none_for_plain_https_url() -> None:
-    """Plain HTTPS repo URL without /tree/ returns None."""
-    assert parse_github_tree_url("https://github.com/org/repo") is None
-
-
-def test_parse_github_tree_url_returns_none_for_plain_https_url_with_git_suffix() -> None:
-    """Plain HTTPS .git URL without /tree/ returns None."""
-    assert parse_github_tree_url("https://github.com/org/repo.git") is None
-
-
-def test_parse_github_tree_url_returns_none_for_ssh_url() -> None:
-    """SSH git@ URLs return None."""
-    assert parse_github_tree_url("git@github.com:org/repo.git") is None
-
-
-def test_parse_github_tree_url_returns_none_for_tree_without_subpath() -> None:
-    """A /tree/<branch> URL with no path after the branch returns None."""
-    assert parse_github_tree_url("https://github.com/org/repo/tree/main") is None
-
-
-def test_parse_github_tree_url_returns_none_for_empty_string() -> None:
-    """Empty string returns None."""
-    assert parse_github_tree_url("") is None
+@pytest.mark.parametrize(
+    "url",
+    [
+        "https://github.com/org/repo",
+        "https://github.com/org/repo.git",
+        "git@github.com:org/repo.git",
+        "https://github.com/org/repo/tree/main",
+        "",
+    ],
+    ids=["plain_https", "plain_https_git_suffix", "ssh", "tree_without_subpath", "empty"],
+)
+def test_parse_github_tree_url_returns_none(url: str) -> None:
+    """URLs that are not /tree/<branch>/<path> URLs (or lack the subpath) return None."""
+    assert parse_github_tree_url(url) is None
 
 
 # ---------------------------------------------------------------------------
@@ -252,6 +353,14 @@ def test_parse_github_tree_url_returns_none_for_empty_string() -> None:
 # ---------------------------------------------------------------------------
 
 
+@pytest.fixture
+def stub_subprocess_run(monkeypatch: pytest.MonkeyPatch) -> MagicMock:
+    """Replace subprocess.run in the module under test with a MagicMock."""
+    stub_run = MagicMock()
+    monkeypatch.setattr("scripts.add_skill_repo_submodule.subprocess.run", stub_run)
+    return stub_run
+
+
 def test_scaffold_skill_creates_skill_directory(tmp_path: Path) -> None:
     """Scaffold creates the skill directory."""
     submodule = tmp_path / "external" / "myrepo"
@@ -303,6 +412,18 @@ def test_scaffold_skill_force_overwrites_existing_references_symlink(tmp_path: P
     assert (skills_dir / "myrepo" / "references").resolve() == docs.resolve()
 
 
+def test_scaffold_skill_force_replaces_existing_references_directory(tmp_path: Path) -> None:
+    """With force=True, a real (non-empty) references directory is replaced by the symlink."""
+    submodule = tmp_path / "external" / "myrepo"
+    (submodule / "docs").mkdir(parents=True)
+    skills_dir = tmp_path / "skills"
+    references = skills_dir / "myrepo" / "references"
+    references.mkdir(parents=True)
+    (references / "stale.md").write_text("")
+    _scaffold_skill_from_subpath(skills_dir, "myrepo", submodule, "docs", force=True, run_skillgen=False)
+    assert references.is_symlink()
+
+
 def test_scaffold_skill_exits_when_subpath_does_not_exist(tmp_path: Path) -> None:
     """Exits with SystemExit when the subpath does not exist inside the submodule."""
     submodule = tmp_path / "external" / "myrepo"
@@ -312,26 +433,26 @@ def test_scaffold_skill_exits_when_subpath_does_not_exist(tmp_path: Path) -> Non
         _scaffold_skill_from_subpath(skills_dir, "myrepo", submodule, "missing/path", force=False, run_skillgen=False)
 
 
-def test_scaffold_skill_does_not_call_claude_when_run_skillgen_false(tmp_path: Path) -> None:
+def test_scaffold_skill_does_not_call_claude_when_run_skillgen_false(
+    tmp_path: Path, stub_subprocess_run: MagicMock
+) -> None:
     """When run_skillgen=False, the Claude CLI is never invoked."""
     submodule = tmp_path / "external" / "myrepo"
     (submodule / "docs").mkdir(parents=True)
     skills_dir = tmp_path / "skills"
-    with patch("scripts.add_skill_repo_submodule.subprocess.run") as mock_run:
-        _scaffold_skill_from_subpath(skills_dir, "myrepo", submodule, "docs", force=False, run_skillgen=False)
-    mock_run.assert_not_called()
+    _scaffold_skill_from_subpath(skills_dir, "myrepo", submodule, "docs", force=False, run_skillgen=False)
+    stub_subprocess_run.assert_not_called()
 
 
-def test_scaffold_skill_calls_claude_when_run_skillgen_true(tmp_path: Path) -> None:
+def test_scaffold_skill_calls_claude_when_run_skillgen_true(tmp_path: Path, stub_subprocess_run: MagicMock) -> None:
     """When run_skillgen=True, subprocess.run is called with the claude CLI."""
     submodule = tmp_path / "external" / "myrepo"
     (submodule / "docs").mkdir(parents=True)
     skills_dir = tmp_path / "skills"
-    with patch("scripts.add_skill_repo_submodule.subprocess.run") as mock_run:
-        _scaffold_skill_from_subpath(skills_dir, "myrepo", submodule, "docs", force=False, run_skillgen=True)
-    assert mock_run.call_count == 1
-    called_cmd = mock_run.call_args[0][0]
-    assert called_cmd[0] == "claude"
+    _scaffold_skill_from_subpath(skills_dir, "myrepo", submodule, "docs", force=False, run_skillgen=True)
+    assert stub_subprocess_run.call_count == 1
+    called_cmd = stub_subprocess_run.call_args[0][0]
+    assert Path(called_cmd[0]).name == "claude"
 
 
 # ---------------------------------------------------------------------------
@@ -339,45 +460,43 @@ def test_scaffold_skill_calls_claude_when_run_skillgen_true(tmp_path: Path) -> N
 # ---------------------------------------------------------------------------
 
 
-def test_run_claude_skillgen_invokes_claude_p(tmp_path: Path) -> None:
+def test_run_claude_skillgen_invokes_claude_p(tmp_path: Path, stub_subprocess_run: MagicMock) -> None:
     """The claude CLI is called with the -p flag."""
-    with patch("scripts.add_skill_repo_submodule.subprocess.run") as mock_run:
-        _run_claude_skillgen(tmp_path)
-    called_cmd = mock_run.call_args[0][0]
-    assert called_cmd[0] == "claude"
+    _run_claude_skillgen(tmp_path)
+    called_cmd = stub_subprocess_run.call_args[0][0]
+    assert Path(called_cmd[0]).name == "claude"
     assert called_cmd[1] == "-p"
 
 
-def test_run_claude_skillgen_passes_dangerously_skip_permissions(tmp_path: Path) -> None:
+def test_run_claude_skillgen_passes_dangerously_skip_permissions(
+    tmp_path: Path, stub_subprocess_run: MagicMock
+) -> None:
     """The --dangerously-skip-permissions flag is passed so Claude can write files unattended."""
-    with patch("scripts.add_skill_repo_submodule.subprocess.run") as mock_run:
-        _run_claude_skillgen(tmp_path)
-    called_cmd = mock_run.call_args[0][0]
+    _run_claude_skillgen(tmp_path)
+    called_cmd = stub_subprocess_run.call_args[0][0]
     assert "--dangerously-skip-permissions" in called_cmd
 
 
-def test_run_claude_skillgen_uses_skill_dir_as_cwd(tmp_path: Path) -> None:
+def test_run_claude_skillgen_uses_skill_dir_as_cwd(tmp_path: Path, stub_subprocess_run: MagicMock) -> None:
     """The claude process runs with cwd set to the skill directory."""
-    with patch("scripts.add_skill_repo_submodule.subprocess.run") as mock_run:
-        _run_claude_skillgen(tmp_path)
-    assert mock_run.call_args[1]["cwd"] == tmp_path
+    _run_claude_skillgen(tmp_path)
+    assert stub_subprocess_run.call_args[1]["cwd"] == tmp_path
 
 
-def test_run_claude_skillgen_handles_file_not_found_gracefully(tmp_path: Path) -> None:
+def test_run_claude_skillgen_handles_file_not_found_gracefully(
+    tmp_path: Path, stub_subprocess_run: MagicMock
+) -> None:
     """FileNotFoundError (claude not in PATH) is caught and does not propagate."""
-    with patch("scripts.add_skill_repo_submodule.subprocess.run", side_effect=FileNotFoundError):
-        _run_claude_skillgen(tmp_path)  # must not raise
+    stub_subprocess_run.side_effect = FileNotFoundError
+    _run_claude_skillgen(tmp_path)  # must not raise
 
 
-def test_run_claude_skillgen_handles_called_process_error_gracefully(tmp_path: Path) -> None:
+def test_run_claude_skillgen_handles_called_process_error_gracefully(
+    tmp_path: Path, stub_subprocess_run: MagicMock
+) -> None:
     """CalledProcessError from claude is caught and does not propagate."""
-    import subprocess
-
-    with patch(
-        "scripts.add_skill_repo_submodule.subprocess.run",
-        side_effect=subprocess.CalledProcessError(1, "claude"),
-    ):
-        _run_claude_skillgen(tmp_path)  # must not raise
+    stub_subprocess_run.side_effect = subprocess.CalledProcessError(1, "claude")
+    _run_claude_skillgen(tmp_path)  # must not raise
 
 
 # ---------------------------------------------------------------------------
@@ -0,0 +1,156 @@
+"""Unit tests for auto_commit (porcelain v2 status parsing and the sync control flow)."""
+
+from __future__ import annotations
+
+import subprocess
+from collections.abc import Callable
+
+import pytest
+
+from scripts import auto_commit
+from scripts.auto_commit import git_status, main, remote_has_changes, run
+
+_SHA = "0" * 40
+# Recorded `git status --porcelain=v2 -z --no-renames` records
+_MODIFIED = f"1 .M N... 100644 100644 100644 {_SHA} {_SHA} f 1.txt"
+_UNTRACKED = "? new.txt"
+_CONFLICT = f"u UU N... 100644 100644 100644 100644 {_SHA} {_SHA} {_SHA} dir/my file.md"
+
+StubRun = Callable[[dict[str, tuple[int, str]]], list[list[str]]]
+
+
+@pytest.fixture
+def stub_run(monkeypatch: pytest.MonkeyPatch) -> StubRun:
+    """Replace auto_commit.run with canned results keyed by git subcommand; returns the call log.
+
+    Subcommands missing from the table succeed with empty output.
+    """
+
+    def install(responses: dict[str, tuple[int, str]]) -> list[list[str]]:
+        calls: list[list[str]] = []
+
+        def fake_run(cmd: list[str], discard_output: bool = False, **_kwargs) -> subprocess.CompletedProcess:
+            calls.append(cmd)
+            # "rev-list", "status", "diff"... identify the call; stash/pull are recorded as-is
+            returncode, stdout = responses.get(cmd[1], (0, ""))
+            return subprocess.CompletedProcess(cmd, returncode, stdout=stdout, stderr="")
+
+        monkeypatch.setattr(auto_commit, "run", fake_run)
+        return calls
+
+    return install
+
+
+def _subcommands(calls: list[list[str]]) -> list[str]:
+    """The git subcommand of each recorded call, in order."""
+    return [cmd[1] for cmd in calls]
+
+
+# ---------------------------------------------------------------------------
+# run
+# ---------------------------------------------------------------------------
+
+
+def test_run_discard_output_sends_output_to_devnull(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Discarded output goes straight to /dev/null instead of being piped and decoded."""
+    calls: list[dict] = []
+
+    def stub_subprocess_run(cmd: list[str], **kwargs) -> subprocess.CompletedProcess:
+        calls.append(kwargs)
+        return subprocess.CompletedProcess(cmd, 0)
+
+    monkeypatch.setattr(subprocess, "run", stub_subprocess_run)
+    run(["git", "fetch"], discard_output=True)
+    output_kwargs = {key: calls[0].get(key) for key in ("stdout", "stderr", "text", "capture_output")}
+    assert output_kwargs == {
+        "stdout": subprocess.DEVNULL,
+        "stderr": subprocess.DEVNULL,
+        "text": None,
+        "capture_output": None,
+    }
+
+
+# ---------------------------------------------------------------------------
+# git_status
+# ---------------------------------------------------------------------------
+
+
+def test_git_status_clean_tree(stub_run: StubRun) -> None:
+    """No records means no changes and no conflicts."""
+    stub_run({"status": (0, "")})
+    assert git_status() == (False, [])
+
+
+def test_git_status_modified_and_untracked_are_changes(stub_run: StubRun) -> None:
+    """Ordinary ("1") and untracked ("?") records count as local changes."""
+    stub_run({"status": (0, f"{_MODIFIED}\0{_UNTRACKED}\0")})
+    assert git_status() == (True, [])
+
+
+def test_git_status_reports_conflicted_path_verbatim(stub_run: StubRun) -> None:
+    """Unmerged ("u") records yield their path, spaces included, from the 11th field."""
+    stub_run({"status": (0, f"{_MODIFIED}\0{_CONFLICT}\0")})
+    assert git_status() == (True, ["dir/my file.md"])
+
+
+# ---------------------------------------------------------------------------
+# remote_has_changes
+# ---------------------------------------------------------------------------
+
+
+def test_remote_has_changes_false_when_upstream_not_ahead(stub_run: StubRun) -> None:
+    """Zero upstream-only commits means nothing to pull."""
+    stub_run({"rev-list": (0, "0\n")})
+    assert remote_has_changes() is False
+
+
+def test_remote_has_changes_true_when_upstream_ahead(stub_run: StubRun) -> None:
+    """Upstream-only commits must be pulled."""
+    stub_run({"rev-list": (0, "3\n")})
+    assert remote_has_changes() is True
+
+
+def test_remote_has_changes_true_when_fetch_fails(stub_run: StubRun) -> None:
+    """An unknown remote state falls back to the regular pull path."""
+    stub_run({"fetch": (1, "")})
+    assert remote_has_changes() is True
+
+
+def test_remote_has_changes_true_without_upstream(stub_run: StubRun) -> None:
+    """A branch without upstream (rev-list error) falls back to the regular pull path."""
+    stub_run({"rev-list": (128, "")})
+    assert remote_has_changes() is True
+
+
+# ---------------------------------------------------------------------------
+# main
+# ---------------------------------------------------------------------------
+
+
+def test_main_nothing_to_sync_runs_only_status_and_fetch(stub_run: StubRun) -> None:
+    """Clean tree and up-to-date upstream: no stash, pull, commit or push."""
+    calls = stub_run({"status": (0, ""), "rev-list": (0, "0\n")})
+    main()
+    assert _subcommands(calls) == ["status", "fetch", "rev-list"]
+
+
+def test_main_nothing_to_sync_succeeds(stub_run: StubRun) -> None:
+    """The no-op run exits 0."""
+    stub_run({"status": (0, ""), "rev-list": (0, "0\n")})
+    assert main() == 0
+
+
+def test_main_local_only_commits_and_pushes_without_rebase(stub_run: StubRun) -> None:
+    """Local changes with nothing upstream skip stash/pull/pop and go straight to commit."""
+    calls = stub_run({"status": (0, f"{_UNTRACKED}\0"), "rev-list": (0, "0\n"), "diff": (1, "")})
+    main()
+    assert _subcommands(calls) == ["status", "fetch", "rev-list", "add", "diff", "commit", "push"]
+
+
+def test_main_upstream_ahead_pulls_before_committing(stub_run: StubRun) -> None:
+    """Upstream commits go through stash, pull --rebase and stash pop before the commit."""
+    calls = stub_run({"status": (0, f"{_UNTRACKED}\0"), "rev-list": (0, "2\n"), "diff": (1, "")})
+    main()
+    assert _subcommands(calls) == [
+        "status", "fetch", "rev-list", "stash", "pull", "stash", "status", "add", "diff", "commit", "push",
+    ]
@@ -0,0 +1,183 @@
+"""Unit tests for skill_sync (symlink creation and the sync CLI)."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+from scripts import skill_sync
+from scripts.skill_sync import create_symlink, scan_entries
+
+
+@pytest.fixture
+def linked_through_symlinked_source(tmp_path: Path) -> tuple[Path, Path]:
+    """A source item that is itself a symlink, and a target linking (relatively) to its real path."""
+    real = tmp_path / "real-skill"
+    real.mkdir()
+    source_dir = tmp_path / "source"
+    source_dir.mkdir()
+    source_item = source_dir / "skill"
+    source_item.symlink_to(real)
+    target_dir = tmp_path / "target"
+    target_dir.mkdir()
+    (target_dir / "skill").symlink_to(os.path.relpath(real, target_dir))
+    return source_item, target_dir / "skill"
+
+
+def test_create_symlink_skips_link_resolving_to_symlinked_source(
+    linked_through_symlinked_source: tuple[Path, Path],
+) -> None:
+    """A link reaching the source item's real path is already linked, even via a symlinked source."""
+    source_item, target_item = linked_through_symlinked_source
+    existing = scan_entries(target_item.parent)["skill"]
+    assert create_symlink(source_item, target_item, existing, force=False, dry_run=False) == (
+        "  [skip] skill (already linked)"
+    )
+
+
+# ---------------------------------------------------------------------------
+# main
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture
+def sync_env(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> tuple[Path, Path]:
+    """A source repo (.claude with two items plus CLAUDE.md) and an empty target, cache isolated."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    source = tmp_path / "src" / ".claude"
+    (source / "skills").mkdir(parents=True)
+    (source / "settings.json").write_text("{}")
+    (tmp_path / "src" / "CLAUDE.md").write_text("# rules")
+    target = tmp_path / "tgt"
+    target.mkdir()
+    return source, target
+
+
+def _run_main(monkeypatch: pytest.MonkeyPatch, *args: str | Path) -> None:
+    """Invoke skill_sync.main with the given command-line arguments."""
+    monkeypatch.setattr("sys.argv", ["skill_sync.py", *map(str, args)])
+    skill_sync.main()
+
+
+def test_main_reports_completed_actions_when_a_link_fails(
+    sync_env: tuple[Path, Path], monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """Buffered status lines are still written when a filesystem call raises part-way."""
+    source, target = sync_env
+    monkeypatch.setattr(skill_sync, "update_gitignore", _raise_oserror)
+    with pytest.raises(OSError):
+        _run_main(monkeypatch, "--source", source, "--target", target)
+    assert "  [link] CLAUDE.md -> " in capsys.readouterr().out
+
+
+def _raise_oserror(*_args: object, **_kwargs: object) -> list[str]:
+    """Stand-in for a filesystem helper that fails."""
+    raise OSError("disk full")
+
+
+def test_main_exits_1_when_source_is_missing(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """A missing source folder is a fatal error."""
+    with pytest.raises(SystemExit) as exc_info:
+        _run_main(monkeypatch, "--source", tmp_path / "missing", "--target", tmp_path)
+    assert exc_info.value.code == 1
+
+
+def test_main_reports_missing_source_on_stderr(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """The missing-source error goes to stderr, not stdout."""
+    with pytest.raises(SystemExit):
+        _run_main(monkeypatch, "--source", tmp_path / "missing", "--target", tmp_path)
+    assert capsys.readouterr().err == f"Error: Source folder does not exist: {tmp_path / 'missing'}\n"
+
+
+def test_main_links_source_items_into_each_target_folder(
+    sync_env: tuple[Path, Path], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Every source item gets a symlink in .claude/ and .codex/ pointing back to it."""
+    source, target = sync_env
+    _run_main(monkeypatch, "--source", source, "--target", target)
+    assert os.readlink(target / ".codex" / "skills") == str(source.resolve() / "skills")
+
+
+def test_main_links_root_files(sync_env: tuple[Path, Path], monkeypatch: pytest.MonkeyPatch) -> None:
+    """CLAUDE.md from the source repo root is linked into the target root."""
+    source, target = sync_env
+    _run_main(monkeypatch, "--source", source, "--target", target)
+    assert (target / "CLAUDE.md").read_text() == "# rules"
+
+
+def test_main_gitignores_synced_paths(sync_env: tuple[Path, Path], monkeypatch: pytest.MonkeyPatch) -> None:
+    """Synced paths are appended to the target's .gitignore under the marker."""
+    source, target = sync_env
+    _run_main(monkeypatch, "--source", source, "--target", target)
+    assert (target / ".gitignore").read_text().splitlines() == [
+        "",
+        skill_sync.GITIGNORE_MARKER,
+        ".claude/settings.json",
+        ".claude/skills",
+        ".codex/settings.json",
+        ".codex/skills",
+        "CLAUDE.md",
+    ]
+
+
+def test_main_dry_run_changes_nothing(sync_env: tuple[Path, Path], monkeypatch: pytest.MonkeyPatch) -> None:
+    """--dry-run leaves the target untouched."""
+    source, target = sync_env
+    _run_main(monkeypatch, "--source", source, "--target", target, "--dry-run")
+    assert list(target.iterdir()) == []
+
+
+# ---------------------------------------------------------------------------
+# scan_entries / create_symlink
+# ---------------------------------------------------------------------------
+
+
+def test_scan_entries_missing_folder_is_empty(tmp_path: Path) -> None:
+    """A folder that doesn't exist has no entries."""
+    assert scan_entries(tmp_path / "missing") == {}
+
+
+def test_scan_entries_maps_names(tmp_path: Path) -> None:
+    """Entries are keyed by their name."""
+    (tmp_path / "a").touch()
+    (tmp_path / "b").mkdir()
+    assert sorted(scan_entries(tmp_path)) == ["a", "b"]
+
+
+def test_create_symlink_links_new_item(tmp_path: Path) -> None:
+    """A missing target becomes a symlink to the source item."""
+    (tmp_path / "src").touch()
+    create_symlink(tmp_path / "src", tmp_path / "dst", None, force=False, dry_run=False)
+    assert os.readlink(tmp_path / "dst") == str(tmp_path / "src")
+
+
+def test_create_symlink_keeps_foreign_link_without_force(tmp_path: Path) -> None:
+    """A link pointing elsewhere is left alone unless --force is given."""
+    (tmp_path / "src").touch()
+    (tmp_path / "dst").symlink_to(tmp_path / "elsewhere")
+    existing = scan_entries(tmp_path)["dst"]
+    assert create_symlink(tmp_path / "src", tmp_path / "dst", existing, force=False, dry_run=False) == (
+        "  [skip] dst (exists, use --force to overwrite)"
+    )
+
+
+def test_create_symlink_force_replaces_real_dir(tmp_path: Path) -> None:
+    """With --force a real directory in the way is removed and replaced by the link."""
+    (tmp_path / "src").touch()
+    (tmp_path / "dst").mkdir()
+    existing = scan_entries(tmp_path)["dst"]
+    create_symlink(tmp_path / "src", tmp_path / "dst", existing, force=True, dry_run=False)
+    assert (tmp_path / "dst").is_symlink()
+
+
+def test_create_symlink_force_updates_foreign_link(tmp_path: Path) -> None:
+    """With --force a link pointing elsewhere is repointed at the source item."""
+    (tmp_path / "src").touch()
+    (tmp_path / "dst").symlink_to(tmp_path / "elsewhere")
+    existing = scan_entries(tmp_path)["dst"]
+    create_symlink(tmp_path / "src", tmp_path / "dst", existing, force=True, dry_run=False)
+    assert os.readlink(tmp_path / "dst") == str(tmp_path / "src")
@@ -0,0 +1,420 @@
+"""Unit tests for translate_for_cursor (flat frontmatter fast path, .mdc writes)."""
+
+from __future__ import annotations
+
+import re
+import stat
+from pathlib import Path
+
+import pytest
+import yaml
+
+from scripts.translate_for_cursor import (
+    _COMPARE_CHUNK_SIZE,
+    _DOCSTRING_CHUNK_SIZE,
+    _parse_flat_frontmatter,
+    _read_docstring,
+    _process_plugin,
+    _sync_mdc,
+    file_needs_update,
+    to_kebab_case,
+    translate_all,
+    translate_skill_dir,
+)
+
+
+@pytest.mark.parametrize(
+    "frontmatter",
+    [
+        "name: pr-review",
+        "name: PR Review\ndescription: Review pull requests for bugs.",
+        "name: skill\n\nversion: v1.2",
+        "description: Use when the user asks for help, or wants a review",
+        "name: a\nname: b",
+        "snake_key: value with spaces",
+        "kebab-key: value-with-hyphens",
+        "name: café au lait",
+        "name: Yesterday",
+        "name: nullable thing",
+        "url: https//example.com/path",
+    ],
+    ids=[
+        "single_key",
+        "two_keys",
+        "blank_line_between",
+        "comma_in_value",
+        "duplicate_key_last_wins",
+        "snake_case_key",
+        "kebab_case_key",
+        "non_ascii_value",
+        "bool_prefix_word",
+        "null_prefix_word",
+        "slashes_in_value",
+    ],
+)
+def test_parse_flat_frontmatter_matches_yaml(frontmatter: str) -> None:
+    """Whatever the fast path accepts, it parses exactly like yaml.safe_load."""
+    assert _parse_flat_frontmatter(frontmatter) == yaml.safe_load(frontmatter)
+
+
+@pytest.mark.parametrize(
+    "frontmatter",
+    [
+        "on: value",
+        "yes: value",
+        "No: value",
+        "null: value",
+        "name: yes",
+        "name: Off",
+        "name: ~",
+        "version: 1.0",
+        "version: 2024-01-01",
+        "name: -1",
+        "name: .inf",
+        "name: 'quoted'",
+        'name: say "hi"',
+        "name: it's",
+        "name: value # comment",
+        "name: issue#12",
+        "name: a: b",
+        "name: time 12:30",
+        "name: [a, b]",
+        "name: {a: b}",
+        "name: *alias",
+        "name: &anchor value",
+        "name: !tag value",
+        "description: >\n  folded",
+        "description: |\n  literal",
+        "name: first\n  continued",
+        "tags:\n  - a",
+        "name:value",
+        "name:",
+        "name:\tvalue",
+        "name: a\rb",
+        "1key: value",
+        "<<: value",
+    ],
+)
+def test_parse_flat_frontmatter_defers_to_yaml(frontmatter: str) -> None:
+    """YAML-special keys and values make the fast path step aside."""
+    assert _parse_flat_frontmatter(frontmatter) is None
+
+
+def test_sync_mdc_preserves_existing_file_mode(tmp_path: Path) -> None:
+    """Rewriting an outdated .mdc keeps the permissions the file already had."""
+    mdc_path = tmp_path / "rule.mdc"
+    mdc_path.write_text("old")
+    mdc_path.chmod(0o600)
+    _sync_mdc(mdc_path, "new", dry_run=False, check=False)
+    assert stat.S_IMODE(mdc_path.stat().st_mode) == 0o600
+
+
+@pytest.fixture
+def symlinked_mdc(tmp_path: Path) -> Path:
+    """Outdated .mdc rule that is a symlink to a file in another directory."""
+    shared = tmp_path / "shared"
+    shared.mkdir()
+    (shared / "rule.mdc").write_text("old")
+    mdc_path = tmp_path / "rule.mdc"
+    mdc_path.symlink_to(shared / "rule.mdc")
+    return mdc_path
+
+
+def test_sync_mdc_keeps_symlinked_rule_a_link(symlinked_mdc: Path) -> None:
+    """The atomic replace swaps the link's target, not the link itself."""
+    _sync_mdc(symlinked_mdc, "new", dry_run=False, check=False)
+    assert symlinked_mdc.is_symlink()
+
+
+def test_sync_mdc_writes_through_symlinked_rule(symlinked_mdc: Path) -> None:
+    """The new content lands in the file the link points to."""
+    _sync_mdc(symlinked_mdc, "new", dry_run=False, check=False)
+    assert symlinked_mdc.resolve().read_text() == "new"
+
+
+def _write_skill(skills_dir: Path, description: str) -> None:
+    """Write a one-skill plugin whose SKILL.md carries description."""
+    skill_dir = skills_dir / "demo"
+    skill_dir.mkdir(parents=True, exist_ok=True)
+    (skill_dir / "SKILL.md").write_text(
+        f"---\nname: demo\ndescription: {description}\n---\n\n# Demo\n"
+    )
+
+
+def test_process_plugin_rereads_rewritten_source(tmp_path: Path) -> None:
+    """A SKILL.md edited between two runs is read again instead of served from cache."""
+    skills_dir = tmp_path / "skills"
+    output_dir = tmp_path / "rules"
+    output_dir.mkdir()
+    _write_skill(skills_dir, "First version")
+    _process_plugin(skills_dir, "plugin", output_dir)
+    _write_skill(skills_dir, "Second version")
+    files, _, _ = _process_plugin(skills_dir, "plugin", output_dir)
+    assert "Second version" in files[0].read_text()
+
+
+def _regex_kebab_case(name: str) -> str:
+    """Regex implementation to_kebab_case replaced, kept as the reference behaviour."""
+    name = name.replace("&", "and")
+    name = re.sub(r"[_\s]+", "-", name)
+    name = re.sub(r"[^a-zA-Z0-9-]", "", name)
+    name = re.sub(r"([a-z])([A-Z])", r"\1-\2", name)
+    name = re.sub(r"-+", "-", name)
+    return name.lower().strip("-")
+
+
+@pytest.mark.parametrize(
+    "name",
+    [
+        "camelCase",
+        "PascalCaseName",
+        "HTTPServer",
+        "parseHTTPResponse",
+        "getURLForID",
+        "version2Update",
+        "v2Beta",
+        "skill 42",
+        "Code Review",
+        "snake_case_name",
+        "  padded  name  ",
+        "mixed _ - separators",
+        "tab\tand\nnewline",
+        "already-kebab-case",
+        "--leading-and-trailing--",
+        "Research & Development",
+        "a&B",
+        "café Name",
+        "drop.dots/and:colons",
+        "aé B",
+        "",
+    ],
+)
+def test_to_kebab_case_matches_regex_version(name: str) -> None:
+    """The single-pass conversion gives the same result as the old regex chain."""
+    assert to_kebab_case(name) == _regex_kebab_case(name)
+
+
+# Content spanning several compare chunks, so a late difference needs more than one read
+_MULTI_CHUNK_BYTES = b"x" * (_COMPARE_CHUNK_SIZE * 2 + 10)
+
+
+@pytest.mark.parametrize(
+    ("existing", "new_bytes", "expected"),
+    [
+        (None, b"content", True),
+        (b"short", b"longer content", True),
+        (_MULTI_CHUNK_BYTES, _MULTI_CHUNK_BYTES[:-1] + b"y", True),
+        (_MULTI_CHUNK_BYTES, _MULTI_CHUNK_BYTES, False),
+    ],
+    ids=["missing_file", "different_size", "same_size_late_difference", "identical"],
+)
+def test_file_needs_update(
+    tmp_path: Path, existing: bytes | None, new_bytes: bytes, expected: bool
+) -> None:
+    """Only a file with exactly the new bytes is considered up to date."""
+    path = tmp_path / "rule.mdc"
+    if existing is not None:
+        path.write_bytes(existing)
+    assert file_needs_update(path, new_bytes) is expected
+
+
+def _docstring_source(body: str) -> str:
+    """Script source whose module docstring is body."""
+    return f'#!/usr/bin/env python\n"""{body}"""\n\nprint("done")\n'
+
+
+# Prefix before the body: the shebang line plus the opening quotes
+_DOCSTRING_PREFIX_LEN = _docstring_source("").index('"""') + 3
+
+
+@pytest.mark.parametrize("closing_offset", [-2, -1, 0])
+def test_read_docstring_finds_quotes_straddling_chunks(
+    tmp_path: Path, closing_offset: int
+) -> None:
+    """Closing quotes split across two reads are still found."""
+    body = "d" * (_DOCSTRING_CHUNK_SIZE + closing_offset - _DOCSTRING_PREFIX_LEN)
+    path = tmp_path / "script.py"
+    path.write_text(_docstring_source(body) + "#" * _DOCSTRING_CHUNK_SIZE)
+    assert _read_docstring(path) == body
+
+
+@pytest.mark.parametrize(
+    ("source", "expected"),
+    [
+        (_docstring_source("Short script."), "Short script."),
+        ('print("no docstring")\n', None),
+        ("", None),
+    ],
+    ids=["shorter_than_chunk", "no_docstring", "empty_file"],
+)
+def test_read_docstring(tmp_path: Path, source: str, expected: str | None) -> None:
+    """Small files are read in one chunk; files without quotes give None."""
+    path = tmp_path / "script.py"
+    path.write_text(source)
+    assert _read_docstring(path) == expected
+
+
+@pytest.fixture
+def full_skill_dir(tmp_path: Path) -> Path:
+    """Skill with frontmatter, an example, a script, a reference and an agent."""
+    skill_dir = tmp_path / "skills" / "pr-review"
+    for subdir in ("examples", "scripts", "references", "agents"):
+        (skill_dir / subdir).mkdir(parents=True)
+    (skill_dir / "SKILL.md").write_text(
+        "---\n"
+        "name: PR Review\n"
+        "description: Review pull requests for bugs.\n"
+        "version: 1.2.0\n"
+        "---\n"
+        "\n"
+        "Check every diff.\n"
+    )
+    (skill_dir / "examples" / "basic-usage.md").write_text("Run it.\n")
+    (skill_dir / "scripts" / "lint.py").write_text('"""Lint the diff.\n\nMore."""\n')
+    (skill_dir / "references" / "api-notes.md").write_text("Endpoint list.\n")
+    (skill_dir / "agents" / "bug-hunter.md").write_text(
+        "---\ndescription: Hunts bugs.\n---\n\n# Bug Hunter\n\nFind bugs.\n"
+    )
+    return skill_dir
+
+
+# Exact .mdc files for full_skill_dir, so any change to the generated text is deliberate
+_GOLDEN_MDC = {
+    "pr-tools-pr-review--agent-bug-hunter.mdc": (
+        "---\n"
+        "description: Hunts bugs.\n"
+        "alwaysApply: false\n"
+        "---\n"
+        "\n"
+        "# Bug Hunter\n"
+        "\n"
+        "_Agent for PR Review skill (pr-tools plugin)_\n"
+        "\n"
+        "# Bug Hunter\n"
+        "\n"
+        "Find bugs."
+    ),
+    "pr-tools-pr-review--api-notes.mdc": (
+        "---\n"
+        "description: Detailed reference for api notes (PR Review skill)\n"
+        "alwaysApply: false\n"
+        "---\n"
+        "\n"
+        "# Api Notes\n"
+        "\n"
+        "_Reference for PR Review skill (pr-tools plugin)_\n"
+        "\n"
+        "Endpoint list."
+    ),
+    "pr-tools-pr-review.mdc": (
+        "---\n"
+        "description: Review pull requests for bugs.\n"
+        "alwaysApply: false\n"
+        "---\n"
+        "\n"
+        "# PR Review\n"
+        "\n"
+        "<!-- Version: 1.2.0 -->\n"
+        "\n"
+        "Check every diff.\n"
+        "\n"
+        "---\n"
+        "\n"
+        "## Examples\n"
+        "\n"
+        "### Basic Usage\n"
+        "\n"
+        "Run it.\n"
+        "\n"
+        "\n"
+        "---\n"
+        "\n"
+        "## Specialized Agents\n"
+        "\n"
+        "The following agent prompts are available for specialized tasks:\n"
+        "\n"
+        "- **Bug Hunter**: Bug Hunter\n"
+        "\n"
+        "\n"
+        "---\n"
+        "\n"
+        "## Available Scripts\n"
+        "\n"
+        "The following scripts are available in the marketplace but cannot be executed "
+        "from Cursor rules:\n"
+        "\n"
+        "- `lint.py`: Lint the diff.\n"
+        "\n"
+        "To use these scripts, run them via `uv run` from the marketplace directory."
+    ),
+}
+
+
+def test_translate_skill_dir_golden_output(
+    tmp_path: Path, full_skill_dir: Path
+) -> None:
+    """The skill, reference and agent .mdc files match the expected text exactly."""
+    output_dir = tmp_path / "rules"
+    output_dir.mkdir()
+    translate_skill_dir(full_skill_dir, "pr-tools", output_dir)
+    generated = {path.name: path.read_text() for path in sorted(output_dir.iterdir())}
+    assert generated == _GOLDEN_MDC
+
+
+def _add_plugin(marketplace: Path, plugin_name: str, skill_md: bytes) -> Path:
+    """Add a plugin with one skill to marketplace and return the skill directory."""
+    plugin_dir = marketplace / "plugins" / plugin_name
+    (plugin_dir / ".claude-plugin").mkdir(parents=True)
+    (plugin_dir / ".claude-plugin" / "plugin.json").write_text("{}")
+    skill_dir = plugin_dir / "skills" / "demo"
+    skill_dir.mkdir(parents=True)
+    (skill_dir / "SKILL.md").write_bytes(skill_md)
+    return skill_dir
+
+
+@pytest.fixture
+def marketplace(tmp_path: Path) -> Path:
+    """Marketplace of three plugins; "beta" has frontmatter PyYAML can't parse."""
+    marketplace = tmp_path / "marketplace"
+    valid = b"---\nname: demo\ndescription: Demo skill\n---\n\nBody\n"
+    _add_plugin(marketplace, "alpha", valid)
+    _add_plugin(marketplace, "beta", b"---\nname: [unclosed\n---\n\nBody\n")
+    _add_plugin(marketplace, "gamma", valid)
+    (tmp_path / "rules").mkdir()
+    return marketplace
+
+
+def test_translate_all_replays_plugins_in_marketplace_order(
+    tmp_path: Path, marketplace: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """Output of the pooled workers comes back in the order plugins were found."""
+    translate_all(marketplace, tmp_path / "rules")
+    lines = capsys.readouterr().out.splitlines()
+    headers = [line for line in lines if line.startswith("Plugin:")]
+    assert headers == [
+        f"Plugin: {path.name}" for path in (marketplace / "plugins").iterdir()
+    ]
+
+
+def test_translate_all_shows_failing_plugin_errors(
+    tmp_path: Path, marketplace: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """Warnings recorded in a worker still reach stderr."""
+    translate_all(marketplace, tmp_path / "rules")
+    beta_skill = marketplace / "plugins" / "beta" / "skills" / "demo" / "SKILL.md"
+    assert f"Warning: YAML error in {beta_skill}" in capsys.readouterr().err
+
+
+def test_translate_all_keeps_output_of_plugin_that_raises(tmp_path: Path) -> None:
+    """Output recorded before an exception is attached to it rather than lost."""
+    marketplace = tmp_path / "marketplace"
+    skill_dir = _add_plugin(
+        marketplace, "broken", b"---\nname: demo\ndescription: Demo skill\n---\n"
+    )
+    # The skill .mdc is written before its references are read, so this fails later
+    (skill_dir / "references").mkdir()
+    (skill_dir / "references" / "notes.md").write_bytes(b"\xff")
+    (tmp_path / "rules").mkdir()
+    with pytest.raises(UnicodeDecodeError) as excinfo:
+        translate_all(marketplace, tmp_path / "rules")
+    assert "→ broken-demo.mdc" in "".join(excinfo.value.__notes__)
@@ -29,11 +29,47 @@ Examples:
 from __future__ import annotations
 
 import argparse
+import contextlib
+import io
+import os
 import re
+import stat
+import string
 import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import cache, partial
+from itertools import groupby
+from operator import itemgetter
 from pathlib import Path
 
-import yaml
+# Default --marketplace/--output, built once: the marketplace root is the parent of scripts/
+_DEFAULT_MARKETPLACE = Path(__file__).parent.parent
+_DEFAULT_OUTPUT = _DEFAULT_MARKETPLACE / ".cursor" / "rules"
+
+# Patterns are compiled once at import instead of going through re's cache on every call
+_HEADING_RE = re.compile(r"^#\s+(.+)$", re.MULTILINE)
+_NAME_RE = re.compile(r"^name:\s*(.+)$", re.MULTILINE)
+_DESCRIPTION_RE = re.compile(r"^description:\s*(.+)$", re.MULTILINE)
+_VERSION_RE = re.compile(r"^version:\s*(.+)$", re.MULTILINE)
+_FLAT_KEY_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_-]*")
+# ASCII character classes for to_kebab_case's single pass
+_KEBAB_KEEP = frozenset(string.ascii_letters + string.digits + "-")
+_KEBAB_LOWER = frozenset(string.ascii_lowercase)
+_KEBAB_UPPER = frozenset(string.ascii_uppercase)
+# First characters that make a YAML value more than a plain string: indicators, quotes,
+# and anything that may resolve to a number, date, null or special float
+_NON_PLAIN_VALUE_START = frozenset("'\"[]{}|<>&*!%@`,?-#~+.0123456789=")
+# Characters that may end a plain scalar or start a comment anywhere in a value; values
+# holding them are left to YAML rather than reasoning about where they are safe
+_NON_PLAIN_VALUE_CHARS = frozenset("'\"#:")
+# YAML 1.1 booleans and nulls that safe_load would not return as strings (keys included)
+_NON_STRING_WORDS = frozenset({"y", "n", "yes", "no", "true", "false", "on", "off", "null"})
+# Threads used to read a plugin's source files ahead of parsing
+PRELOAD_WORKERS = 16
+# Read size used when comparing an existing output file against freshly generated content
+_COMPARE_CHUNK_SIZE = 64 * 1024
+# Scripts open with their docstring, so a small read usually covers it
+_DOCSTRING_CHUNK_SIZE = 4096
 
 
 def find_skill_file(skill_dir: Path) -> Path | None:
@@ -46,9 +82,151 @@ def find_skill_file(skill_dir: Path) -> Path | None:
     return None
 
 
+def _list_suffix(directory: Path, suffix: str) -> list[Path]:
+    """List the files in directory whose name ends with suffix, in directory order.
+
+    A single scandir pass: a missing directory simply yields nothing.
+    """
+    try:
+        with os.scandir(directory) as it:
+            return [Path(e.path) for e in it if e.name.endswith(suffix) and e.is_file()]
+    except FileNotFoundError:
+        return []
+
+
+# Texts read during the current _process_plugin call; None outside of one, so files are
+# never served stale across plugins or runs and memory is released after each plugin
+_text_cache: dict[Path, str] | None = None
+
+
+@contextlib.contextmanager
+def _text_cache_scope():
+    """Share file reads between the passes over one plugin, dropping them afterwards."""
+    global _text_cache
+    _text_cache = {}
+    try:
+        yield
+    finally:
+        _text_cache = None
+
+
+def _read_text(path: Path) -> str:
+    """Read a UTF-8 file, at most once per _text_cache_scope.
+
+    Agent files are needed both for the skill's agent listing and for their own .mdc.
+    """
+    text_cache = _text_cache
+    if text_cache is None:
+        return path.read_text(encoding="utf-8")
+    text = text_cache.get(path)
+    if text is None:
+        text = text_cache[path] = path.read_text(encoding="utf-8")
+    return text
+
+
+def _read_docstring(path: Path) -> str | None:
+    """Return the text of the first triple-quoted string in a file, or None.
+
+    The file is read in chunks and scanned with str.find, stopping as soon as the
+    closing quotes have been seen.
+    """
+    text = ""
+    start = -1
+    with path.open(encoding="utf-8") as f:
+        while chunk := f.read(_DOCSTRING_CHUNK_SIZE):
+            # Quotes may straddle the previous chunk boundary
+            scan_from = max(len(text) - 2, 0)
+            text += chunk
+            if start == -1:
+                start = text.find('"""', scan_from)
+                if start == -1:
+                    continue
+            end = text.find('"""', max(start + 3, scan_from))
+            if end != -1:
+                return text[start + 3 : end]
+    return None
+
+
+def _parse_flat_frontmatter(frontmatter_str: str) -> dict | None:
+    """Parse frontmatter made only of ``key: plain string`` lines without PyYAML.
+
+    Returns None as soon as a line needs real YAML semantics (block scalars, lists,
+    quoting, continuation lines, comments, or keys and values that are not plain
+    strings) so the caller falls back to yaml.safe_load and gets exactly the same result.
+    """
+    data = {}
+    for line in frontmatter_str.split("\n"):
+        if not line.strip():
+            continue
+        key, sep, value = line.partition(":")
+        value = value.strip()
+        if (
+            not sep
+            or not _FLAT_KEY_RE.fullmatch(key)
+            or not value
+            or not line[len(key) + 1].isspace()
+            or not line.isprintable()
+            or key.lower() in _NON_STRING_WORDS
+            or value[0] in _NON_PLAIN_VALUE_START
+            or not _NON_PLAIN_VALUE_CHARS.isdisjoint(value)
+            or value.lower() in _NON_STRING_WORDS
+        ):
+            return None
+        data[key] = value
+    return data
+
+
+def _split_frontmatter(content: str) -> tuple[str, str] | None:
+    """Split content into (frontmatter, body) around its leading --- block, if any."""
+    if not content.startswith("---\n"):
+        return None
+    # The closing delimiter is the first "\n---\n" after the opening line
+    end = content.find("\n---\n", 4)
+    if end == -1:
+        return None
+    return content[4:end], content[end + 5 :]
+
+
+class _FrontmatterError(ValueError):
+    """Raised when YAML frontmatter cannot be parsed."""
+
+
+@cache
+def _load_frontmatter(frontmatter_str: str):
+    """Load frontmatter via the flat-key fast path, falling back to yaml.safe_load.
+
+    Results are cached by text, so a skill reached twice (symlinked skill directories,
+    copies shared between skills) is only parsed once. Callers must not mutate them.
+    """
+    data = _parse_flat_frontmatter(frontmatter_str)
+    if data is not None:
+        return data
+    # Imported here: runs where every frontmatter takes the fast path never pay for it
+    import yaml
+
+    try:
+        return yaml.safe_load(frontmatter_str)
+    except yaml.YAMLError as e:
+        raise _FrontmatterError(str(e)) from e
+
+
+def _needs_whitespace_collapse(text: str) -> bool:
+    """Return whether " ".join(text.split()) would differ from text.
+
+    Printable text only has plain spaces for whitespace, so it is already collapsed
+    unless it has doubled, leading or trailing spaces.
+    """
+    return (
+        "  " in text
+        or text.startswith(" ")
+        or text.endswith(" ")
+        or not text.isprintable()
+    )
+
+
 def parse_skill_md(path: Path, skill_name_fallback: str | None = None) -> dict | None:
     """Extract YAML frontmatter and body from SKILL.md."""
-    content = path.read_text(encoding="utf-8")
+    content = _read_text(path)
 
     # Determine fallback name from parent dir or filename
     if skill_name_fallback is None:
@@ -58,16 +236,16 @@ def parse_skill_md(path: Path, skill_name_fallback: str | None = None) -> dict |
         else:
             skill_name_fallback = path.parent.name
 
-    # Match YAML frontmatter between --- delimiters
-    match = re.match(r"^---\n(.*?)\n---\n(.*)$", content, re.DOTALL)
-    if not match:
+    # Split YAML frontmatter between --- delimiters
+    parts = _split_frontmatter(content)
+    if parts is None:
         # No frontmatter - use directory name and full content as body
         print(
             f"  Warning: No frontmatter in {path} - using fallback name",
             file=sys.stderr,
         )
         # Try to extract first heading as name
-        heading_match = re.match(r"^#\s+(.+)$", content, re.MULTILINE)
+        heading_match = _HEADING_RE.match(content)
         name = (
             heading_match.group(1)
             if heading_match
@@ -81,32 +259,32 @@ def parse_skill_md(path: Path, skill_name_fallback: str | None = None) -> dict |
             "path": path,
         }
 
-    frontmatter_str, body = match.groups()
+    frontmatter_str, body = parts
 
     try:
-        frontmatter = yaml.safe_load(frontmatter_str)
+        frontmatter = _load_frontmatter(frontmatter_str)
         if frontmatter is None:
             frontmatter = {}
-    except yaml.YAMLError:
+    except _FrontmatterError:
         # YAML parse error - try manual extraction
         print(f"  Warning: YAML error in {path}, trying manual parse", file=sys.stderr)
         frontmatter = {}
         # Try to extract name manually
-        name_match = re.search(r"^name:\s*(.+)$", frontmatter_str, re.MULTILINE)
+        name_match = _NAME_RE.search(frontmatter_str)
         if name_match:
             frontmatter["name"] = name_match.group(1).strip()
         # Try to extract description (first line only to avoid colons)
-        desc_match = re.search(r"^description:\s*(.+)$", frontmatter_str, re.MULTILINE)
+        desc_match = _DESCRIPTION_RE.search(frontmatter_str)
         if desc_match:
             frontmatter["description"] = desc_match.group(1).strip()
         # Try to extract version
-        ver_match = re.search(r"^version:\s*(.+)$", frontmatter_str, re.MULTILINE)
+        ver_match = _VERSION_RE.search(frontmatter_str)
         if ver_match:
             frontmatter["version"] = ver_match.group(1).strip()
 
     # Handle description that might be a multi-line string
     description = frontmatter.get("description", f"Skill for {skill_name_fallback}")
-    if isinstance(description, str):
+    if isinstance(description, str) and _needs_whitespace_collapse(description):
         # Collapse multi-line descriptions to single line
         description = " ".join(description.split())
 
@@ -121,17 +299,17 @@ def parse_skill_md(path: Path, skill_name_fallback: str | None = None) -> dict |
 
 def parse_reference_md(path: Path, skill_name: str, plugin_name: str) -> dict:
     """Parse a reference or agent markdown file."""
-    content = path.read_text(encoding="utf-8")
+    content = _read_text(path)
     ref_name = path.stem  # e.g., "bug-hunter" from "bug-hunter.md"
 
     # Check for YAML frontmatter
-    match = re.match(r"^---\n(.*?)\n---\n(.*)$", content, re.DOTALL)
-    if match:
-        frontmatter_str, body = match.groups()
+    parts = _split_frontmatter(content)
+    if parts is not None:
+        frontmatter_str, body = parts
         try:
-            frontmatter = yaml.safe_load(frontmatter_str)
+            frontmatter = _load_frontmatter(frontmatter_str)
             description = frontmatter.get("description", "") if frontmatter else ""
-        except yaml.YAMLError:
+        except _FrontmatterError:
             description = ""
             body = content
     else:
@@ -153,6 +331,11 @@ def parse_reference_md(path: Path, skill_name: str, plugin_name: str) -> dict:
     }
 
 
+def _titleize(name: str) -> str:
+    """Turn a kebab/snake-case file stem into a Title Case heading."""
+    return name.replace("-", " ").replace("_", " ").title()
+
+
 def generate_mdc(
     skill_data: dict,
     plugin_name: str,
@@ -161,54 +344,47 @@ def generate_mdc(
     agents: list[Path] | None = None,
 ) -> str:
     """Generate .mdc file content from skill data."""
-    lines = [
-        "---",
-        f"description: {skill_data['description']}",
-        "alwaysApply: false",
-        "---",
-        "",
-        f"# {skill_data['name']}",
-        "",
-    ]
+    buf = io.StringIO()
+    # Every write after the header starts with its own line break, so the content ends
+    # exactly where the last section does
+    w = buf.write
+    w(
+        "---\n"
+        f"description: {skill_data['description']}\n"
+        "alwaysApply: false\n"
+        "---\n"
+        "\n"
+        f"# {skill_data['name']}\n"
+    )
 
     # Add version comment if present
-    if skill_data.get("version"):
-        lines.append(f"<!-- Version: {skill_data['version']} -->")
-        lines.append("")
+    version = skill_data.get("version")
+    if version:
+        w(f"\n<!-- Version: {version} -->\n")
 
     # Add main body
-    lines.append(skill_data["body"])
+    w(f"\n{skill_data['body']}")
 
     # Inline examples if present
     if examples:
-        lines.append("")
-        lines.append("---")
-        lines.append("")
-        lines.append("## Examples")
-        lines.append("")
+        w("\n\n---\n\n## Examples\n")
         for example_path in examples:
             example_content = example_path.read_text(encoding="utf-8").strip()
-            example_name = example_path.stem.replace("-", " ").replace("_", " ").title()
-            lines.append(f"### {example_name}")
-            lines.append("")
-            lines.append(example_content)
-            lines.append("")
+            example_name = _titleize(example_path.stem)
+            w(f"\n### {example_name}\n\n{example_content}\n")
 
     # Document agents if present
     if agents:
-        lines.append("")
-        lines.append("---")
-        lines.append("")
-        lines.append("## Specialized Agents")
-        lines.append("")
-        lines.append("The following agent prompts are available for specialized tasks:")
-        lines.append("")
+        w(
+            "\n\n---\n\n## Specialized Agents\n\n"
+            "The following agent prompts are available for specialized tasks:\n"
+        )
         for agent_path in agents:
-            agent_name = agent_path.stem.replace("-", " ").replace("_", " ").title()
+            agent_name = _titleize(agent_path.stem)
             # Try to get first line description from the file
-            agent_content = agent_path.read_text(encoding="utf-8")
+            agent_content = _read_text(agent_path)
             # Look for first heading or first paragraph
-            heading_match = re.search(r"^#\s+(.+)$", agent_content, re.MULTILINE)
+            heading_match = _HEADING_RE.search(agent_content)
             if heading_match:
                 agent_desc = heading_match.group(1)
             else:
@@ -217,92 +393,155 @@ def generate_mdc(
                     line.strip() for line in agent_content.split("\n") if line.strip()
                 ]
                 agent_desc = first_lines[0][:80] if first_lines else "Agent prompt"
-            lines.append(f"- **{agent_name}**: {agent_desc}")
-        lines.append("")
+            w(f"\n- **{agent_name}**: {agent_desc}")
+        w("\n")
 
     # Document scripts if present
     if scripts:
-        lines.append("")
-        lines.append("---")
-        lines.append("")
-        lines.append("## Available Scripts")
-        lines.append("")
-        lines.append(
-            "The following scripts are available in the marketplace but cannot be executed from Cursor rules:"
+        w(
+            "\n\n---\n\n## Available Scripts\n\n"
+            "The following scripts are available in the marketplace but cannot be executed from Cursor rules:\n"
         )
-        lines.append("")
         for script_path in scripts:
             script_name = script_path.name
             # Read first docstring if present
-            script_content = script_path.read_text(encoding="utf-8")
-            docstring_match = re.search(r'"""(.*?)"""', script_content, re.DOTALL)
-            if docstring_match:
-                docstring = (
-                    docstring_match.group(1).strip().split("\n")[0]
-                )  # First line only
+            docstring = _read_docstring(script_path)
+            if docstring is not None:
+                docstring = docstring.strip().split("\n", 1)[0]  # First line only
             else:
                 docstring = "No description available"
-            lines.append(f"- `{script_name}`: {docstring}")
-        lines.append("")
-        lines.append(
+            w(f"\n- `{script_name}`: {docstring}")
+        w(
+            "\n\n"
             "To use these scripts, run them via `uv run` from the marketplace directory."
         )
 
-    return "\n".join(lines)
+    return buf.getvalue()
 
 
 def generate_reference_mdc(ref_data: dict, ref_type: str = "reference") -> str:
     """Generate .mdc file content for a reference or agent document."""
-    lines = [
-        "---",
-        f"description: {ref_data['description']}",
-        "alwaysApply: false",
-        "---",
-        "",
-        f"# {ref_data['name'].replace('-', ' ').replace('_', ' ').title()}",
-        "",
-        f"_{ref_type.title()} for {ref_data['skill_name']} skill ({ref_data['plugin_name']} plugin)_",
-        "",
-        ref_data["body"],
-    ]
-    return "\n".join(lines)
+    title = _titleize(ref_data["name"])
+    return (
+        "---\n"
+        f"description: {ref_data['description']}\n"
+        "alwaysApply: false\n"
+        "---\n"
+        "\n"
+        f"# {title}\n"
+        "\n"
+        f"_{ref_type.title()} for {ref_data['skill_name']} skill ({ref_data['plugin_name']} plugin)_\n"
+        "\n"
+        f"{ref_data['body']}"
+    )
+
+
+class _KebabTable(dict):
+    """str.translate table for to_kebab_case, filled in lazily per code point.
+
+    Separators (underscores and any whitespace) become hyphens, "&" becomes "and",
+    ASCII letters, digits and hyphens are kept, and everything else is deleted.
+    """
+
+    def __missing__(self, code: int) -> str | None:
+        char = chr(code)
+        if char == "_" or char.isspace():
+            value = "-"
+        elif char in _KEBAB_KEEP:
+            value = char
+        else:
+            value = None
+        self[code] = value
+        return value
+
+
+_KEBAB_TABLE = _KebabTable({ord("&"): "and"})
 
 
 def to_kebab_case(name: str) -> str:
     """Convert a name to kebab-case."""
-    # Replace & with "and"
-    name = name.replace("&", "and")
-    # Replace underscores and spaces with hyphens
-    name = re.sub(r"[_\s]+", "-", name)
-    # Remove any non-alphanumeric characters except hyphens
-    name = re.sub(r"[^a-zA-Z0-9-]", "", name)
-    # Insert hyphen before uppercase letters and lowercase them
-    name = re.sub(r"([a-z])([A-Z])", r"\1-\2", name)
-    # Collapse multiple hyphens
-    name = re.sub(r"-+", "-", name)
-    return name.lower().strip("-")
-
-
-def file_needs_update(path: Path, new_content: str) -> bool:
+    out = []
+    prev = ""
+    # Mapping and filtering happen in C; the loop only handles camelCase and hyphen runs
+    for char in name.translate(_KEBAB_TABLE):
+        if char == "-":
+            # Collapse multiple hyphens
+            if prev != "-":
+                out.append("-")
+        else:
+            # Hyphen between a lowercase letter and the uppercase one that follows it
+            if char in _KEBAB_UPPER and prev in _KEBAB_LOWER:
+                out.append("-")
+            out.append(char)
+        prev = char
+    return "".join(out).lower().strip("-")
+
+
+def file_needs_update(path: Path, new_bytes: bytes) -> bool:
     """Check if file doesn't exist or has different content."""
-    if not path.exists():
-        return True
     try:
-        existing = path.read_text(encoding="utf-8")
-        return existing != new_content
-    except (OSError, UnicodeDecodeError):
+        # A size mismatch settles it with a single stat, no read or decode
+        if path.stat().st_size != len(new_bytes):
+            return True
+        # Same size: compare raw bytes chunk by chunk, stopping at the first difference
+        view = memoryview(new_bytes)
+        with path.open("rb") as f:
+            offset = 0
+            while chunk := f.read(_COMPARE_CHUNK_SIZE):
+                if chunk != view[offset : offset + len(chunk)]:
+                    return True
+                offset += len(chunk)
+        return offset != len(new_bytes)
+    except OSError:
         return True
 
 
+def _sync_mdc(mdc_path: Path, mdc_content: str, dry_run: bool, check: bool) -> bool:
+    """Check or write one generated .mdc file, printing its status line.
+
+    Returns True when check mode finds the file outdated. Files whose content is
+    already current are not rewritten, so their mtime stays untouched.
+    """
+    new_bytes = mdc_content.encode("utf-8")
+    if check:
+        if file_needs_update(mdc_path, new_bytes):
+            print(f"  ✗ {mdc_path.name} (needs update)")
+            return True
+        print(f"  ✓ {mdc_path.name}")
+        return False
+    print(f"  → {mdc_path.name}")
+    if not dry_run and file_needs_update(mdc_path, new_bytes):
+        # Replace the file a symlinked rule points to rather than the link itself
+        target = Path(os.path.realpath(mdc_path))
+        # Write beside the target and rename over it, so Cursor never sees a partial rule
+        tmp_path = target.with_name(f".{target.name}.tmp")
+        try:
+            tmp_path.write_bytes(new_bytes)
+            # The rename would otherwise swap in the temp file's default mode
+            try:
+                os.chmod(tmp_path, stat.S_IMODE(os.stat(target).st_mode))
+            except FileNotFoundError:
+                pass
+            os.replace(tmp_path, target)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+    return False
+
+
 def translate_skill_dir(
     skill_dir: Path,
     plugin_name: str,
     output_dir: Path,
     dry_run: bool = False,
     check: bool = False,
+    plugin_kebab: str | None = None,
 ) -> tuple[list[Path], list[Path]]:
     """Translate a single skill directory to .mdc files.
 
+    plugin_kebab may be passed by callers translating many skills of one plugin so the
+    plugin name is only converted once.
+
     Returns:
         Tuple of (generated_files, outdated_files).
         In check mode, outdated_files contains files that need updating.
@@ -316,78 +555,46 @@ def translate_skill_dir(
         return [], []
 
     skill_name = to_kebab_case(skill_data["name"])
-    plugin_kebab = to_kebab_case(plugin_name)
+    if plugin_kebab is None:
+        plugin_kebab = to_kebab_case(plugin_name)
     output_files = []
     outdated_files = []
 
     # Find examples, scripts, references, and agents
-    examples_dir = skill_dir / "examples"
-    scripts_dir = skill_dir / "scripts"
-    refs_dir = skill_dir / "references"
-    agents_dir = skill_dir / "agents"
-
-    examples = list(examples_dir.glob("*.md")) if examples_dir.exists() else []
-    scripts = list(scripts_dir.glob("*.py")) if scripts_dir.exists() else []
-    agents = list(agents_dir.glob("*.md")) if agents_dir.exists() else []
+    examples = _list_suffix(skill_dir / "examples", ".md")
+    scripts = _list_suffix(skill_dir / "scripts", ".py")
+    refs = _list_suffix(skill_dir / "references", ".md")
+    agents = _list_suffix(skill_dir / "agents", ".md")
 
     # Generate main skill .mdc
     mdc_content = generate_mdc(skill_data, plugin_name, examples, scripts, agents)
-    mdc_filename = f"{plugin_kebab}-{skill_name}.mdc"
-    mdc_path = output_dir / mdc_filename
+    mdc_path = output_dir / f"{plugin_kebab}-{skill_name}.mdc"
 
-    if check:
-        if file_needs_update(mdc_path, mdc_content):
-            print(f"  ✗ {mdc_filename} (needs update)")
-            outdated_files.append(mdc_path)
-        else:
-            print(f"  ✓ {mdc_filename}")
-    else:
-        print(f"  → {mdc_filename}")
-        if not dry_run:
-            mdc_path.write_text(mdc_content, encoding="utf-8")
+    if _sync_mdc(mdc_path, mdc_content, dry_run, check):
+        outdated_files.append(mdc_path)
     output_files.append(mdc_path)
 
     # Generate separate .mdc for each reference
-    if refs_dir.exists():
-        for ref_path in refs_dir.glob("*.md"):
-            ref_data = parse_reference_md(ref_path, skill_data["name"], plugin_name)
-            ref_mdc_content = generate_reference_mdc(ref_data, "reference")
-            ref_name = to_kebab_case(ref_data["name"])
-            ref_mdc_filename = f"{plugin_kebab}-{skill_name}--{ref_name}.mdc"
-            ref_mdc_path = output_dir / ref_mdc_filename
-
-            if check:
-                if file_needs_update(ref_mdc_path, ref_mdc_content):
-                    print(f"  ✗ {ref_mdc_filename} (needs update)")
-                    outdated_files.append(ref_mdc_path)
-                else:
-                    print(f"  ✓ {ref_mdc_filename}")
-            else:
-                print(f"  → {ref_mdc_filename}")
-                if not dry_run:
-                    ref_mdc_path.write_text(ref_mdc_content, encoding="utf-8")
-            output_files.append(ref_mdc_path)
+    for ref_path in refs:
+        ref_data = parse_reference_md(ref_path, skill_data["name"], plugin_name)
+        ref_mdc_content = generate_reference_mdc(ref_data, "reference")
+        ref_name = to_kebab_case(ref_data["name"])
+        ref_mdc_path = output_dir / f"{plugin_kebab}-{skill_name}--{ref_name}.mdc"
+
+        if _sync_mdc(ref_mdc_path, ref_mdc_content, dry_run, check):
+            outdated_files.append(ref_mdc_path)
+        output_files.append(ref_mdc_path)
 
     # Generate separate .mdc for each agent
-    if agents_dir.exists():
-        for agent_path in agents_dir.glob("*.md"):
-            agent_data = parse_reference_md(agent_path, skill_data["name"], plugin_name)
-            agent_mdc_content = generate_reference_mdc(agent_data, "agent")
-            agent_name = to_kebab_case(agent_data["name"])
-            agent_mdc_filename = f"{plugin_kebab}-{skill_name}--agent-{agent_name}.mdc"
-            agent_mdc_path = output_dir / agent_mdc_filename
-
-            if check:
-                if file_needs_update(agent_mdc_path, agent_mdc_content):
-                    print(f"  ✗ {agent_mdc_filename} (needs update)")
-                    outdated_files.append(agent_mdc_path)
-                else:
-                    print(f"  ✓ {agent_mdc_filename}")
-            else:
-                print(f"  → {agent_mdc_filename}")
-                if not dry_run:
-                    agent_mdc_path.write_text(agent_mdc_content, encoding="utf-8")
-            output_files.append(agent_mdc_path)
+    for agent_path in agents:
+        agent_data = parse_reference_md(agent_path, skill_data["name"], plugin_name)
+        agent_mdc_content = generate_reference_mdc(agent_data, "agent")
+        agent_name = to_kebab_case(agent_data["name"])
+        agent_mdc_path = output_dir / f"{plugin_kebab}-{skill_name}--agent-{agent_name}.mdc"
+
+        if _sync_mdc(agent_mdc_path, agent_mdc_content, dry_run, check):
+            outdated_files.append(agent_mdc_path)
+        output_files.append(agent_mdc_path)
 
     return output_files, outdated_files
 
@@ -398,6 +605,7 @@ def translate_skill_file(
     output_dir: Path,
     dry_run: bool = False,
     check: bool = False,
+    plugin_kebab: str | None = None,
 ) -> tuple[list[Path], list[Path]]:
     """Translate a direct skill .md file (not in a subdirectory) to .mdc.
 
@@ -409,28 +617,129 @@ def translate_skill_file(
         return [], []
 
     skill_name = to_kebab_case(skill_data["name"])
-    plugin_kebab = to_kebab_case(plugin_name)
+    if plugin_kebab is None:
+        plugin_kebab = to_kebab_case(plugin_name)
     outdated_files = []
 
     # Generate main skill .mdc
     mdc_content = generate_mdc(skill_data, plugin_name)
-    mdc_filename = f"{plugin_kebab}-{skill_name}.mdc"
-    mdc_path = output_dir / mdc_filename
+    mdc_path = output_dir / f"{plugin_kebab}-{skill_name}.mdc"
 
-    if check:
-        if file_needs_update(mdc_path, mdc_content):
-            print(f"  ✗ {mdc_filename} (needs update)")
-            outdated_files.append(mdc_path)
-        else:
-            print(f"  ✓ {mdc_filename}")
-    else:
-        print(f"  → {mdc_filename}")
-        if not dry_run:
-            mdc_path.write_text(mdc_content, encoding="utf-8")
+    if _sync_mdc(mdc_path, mdc_content, dry_run, check):
+        outdated_files.append(mdc_path)
 
     return [mdc_path], outdated_files
 
 
+class _RecordingStream(io.TextIOBase):
+    """Text stream that records writes as (stream name, text) for later replay."""
+
+    def __init__(self, records: list[tuple[str, str]], name: str):
+        self._records = records
+        self._name = name
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, s: str) -> int:
+        self._records.append((self._name, s))
+        return len(s)
+
+
+def _replay_output(records: list[tuple[str, str]]) -> None:
+    """Write recorded output with one write and flush per run of same-stream records.
+
+    Flushing at each stream switch keeps warnings in place relative to progress lines,
+    whether or not stdout and stderr end up in the same file.
+    """
+    for stream_name, run in groupby(records, key=itemgetter(0)):
+        stream = getattr(sys, stream_name)
+        stream.write("".join(text for _, text in run))
+        stream.flush()
+
+
+def _preload_source(path: Path) -> None:
+    """Read path into _read_text's cache, leaving any error to the file's real reader."""
+    try:
+        _read_text(path)
+    except (OSError, UnicodeDecodeError):
+        pass
+
+
+def _preload_sources(entries: list[Path]) -> None:
+    """Warm _read_text's cache for the skill, reference and agent files under entries.
+
+    Reads release the GIL, so a thread pool overlaps them on a cold page cache instead
+    of waiting on one file at a time.
+    """
+    paths = []
+    for entry in entries:
+        if entry.is_dir():
+            skill_md = find_skill_file(entry)
+            if skill_md:
+                paths.append(skill_md)
+                paths.extend(_list_suffix(entry / "references", ".md"))
+                paths.extend(_list_suffix(entry / "agents", ".md"))
+        elif entry.is_file() and entry.suffix == ".md":
+            paths.append(entry)
+    if len(paths) < 2:
+        return
+    with ThreadPoolExecutor(max_workers=min(PRELOAD_WORKERS, len(paths))) as executor:
+        executor.map(_preload_source, paths)
+
+
+def _process_plugin(
+    skills_dir: Path,
+    plugin_name: str,
+    output_dir: Path,
+    dry_run: bool = False,
+    check: bool = False,
+) -> tuple[list[Path], list[Path], list[tuple[str, str]]]:
+    """Translate every skill of one plugin, recording its output instead of printing it.
+
+    Returns:
+        Tuple of (generated_files, outdated_files, output_records). The records keep
+        stdout and stderr writes in order so the caller can replay them per plugin.
+    """
+    output_files = []
+    all_outdated = []
+    records: list[tuple[str, str]] = []
+    plugin_kebab = to_kebab_case(plugin_name)
+
+    try:
+        with (
+            contextlib.redirect_stdout(_RecordingStream(records, "stdout")),
+            contextlib.redirect_stderr(_RecordingStream(records, "stderr")),
+            _text_cache_scope(),
+        ):
+            entries = list(skills_dir.iterdir())
+            _preload_sources(entries)
+            for entry in entries:
+                if entry.is_dir():
+                    # Skill in subdirectory (e.g., skills/pr-review/SKILL.md)
+                    files, outdated = translate_skill_dir(
+                        entry, plugin_name, output_dir, dry_run, check, plugin_kebab
+                    )
+                    output_files.extend(files)
+                    all_outdated.extend(outdated)
+                elif entry.is_file() and entry.suffix == ".md":
+                    # Direct skill file (e.g., skills/fhevm-developer.md)
+                    files, outdated = translate_skill_file(
+                        entry, plugin_name, output_dir, dry_run, check, plugin_kebab
+                    )
+                    output_files.extend(files)
+                    all_outdated.extend(outdated)
+    except Exception as exc:
+        # The caller never gets the records of a plugin that raised, so the output
+        # recorded up to the failure travels with the exception into its traceback
+        if records:
+            output = "".join(text for _, text in records)
+            exc.add_note(f"Output of plugin {plugin_name}:\n{output}")
+        raise
+
+    return output_files, all_outdated, records
+
+
 def translate_all(
     marketplace_path: Path,
     output_dir: Path,
@@ -440,6 +749,10 @@ def translate_all(
 ) -> tuple[list[Path], list[Path]]:
     """Walk marketplace and translate all skills.
 
+    Plugins are independent, so they are translated in worker processes (PyYAML and
+    the regex work are CPU-bound under the GIL); each plugin's output is replayed in
+    marketplace order once its worker is done.
+
     Returns:
         Tuple of (generated_files, outdated_files).
     """
@@ -453,6 +766,7 @@ def translate_all(
         return output_files, all_outdated
 
     # Find all plugin directories (those with .claude-plugin/plugin.json)
+    plugins = []
     for plugin_dir in plugins_dir.iterdir():
         if not plugin_dir.is_dir():
             continue
@@ -469,29 +783,31 @@ def translate_all(
         if plugin_filter and plugin_name not in plugin_filter:
             continue
 
-        print(f"Plugin: {plugin_name}")
-
-        # Find skills directory
-        skills_dir = plugin_dir / "skills"
-        if not skills_dir.exists():
-            print("  (no skills directory)")
-            continue
-
-        for entry in skills_dir.iterdir():
-            if entry.is_dir():
-                # Skill in subdirectory (e.g., skills/pr-review/SKILL.md)
-                files, outdated = translate_skill_dir(
-                    entry, plugin_name, output_dir, dry_run, check
-                )
-                output_files.extend(files)
-                all_outdated.extend(outdated)
-            elif entry.is_file() and entry.suffix == ".md":
-                # Direct skill file (e.g., skills/fhevm-developer.md)
-                files, outdated = translate_skill_file(
-                    entry, plugin_name, output_dir, dry_run, check
-                )
-                output_files.extend(files)
-                all_outdated.extend(outdated)
+        plugins.append((plugin_name, plugin_dir / "skills"))
+
+    names = [name for name, skills_dir in plugins if skills_dir.exists()]
+    skills_dirs = [skills_dir for _, skills_dir in plugins if skills_dir.exists()]
+    worker = partial(_process_plugin, output_dir=output_dir, dry_run=dry_run, check=check)
+    with contextlib.ExitStack() as stack:
+        if len(names) > 1:
+            # A single plugin isn't worth the pool start-up cost
+            workers = min(len(names), os.cpu_count() or 1)
+            executor = stack.enter_context(ProcessPoolExecutor(max_workers=workers))
+            results = executor.map(worker, skills_dirs, names)
+        else:
+            results = map(worker, skills_dirs, names)
+
+        # Results arrive in plugin order, so every plugin before a failing one is
+        # replayed before its exception propagates
+        for plugin_name, skills_dir in plugins:
+            if not skills_dir.exists():
+                print(f"Plugin: {plugin_name}\n  (no skills directory)")
+                continue
+            files, outdated, records = next(results)
+            # The header goes out in the same write as the plugin's first progress lines
+            _replay_output([("stdout", f"Plugin: {plugin_name}\n"), *records])
+            output_files.extend(files)
+            all_outdated.extend(outdated)
 
     return output_files, all_outdated
 
@@ -505,13 +821,13 @@ def main():
     parser.add_argument(
         "--marketplace",
         type=Path,
-        default=Path(__file__).parent.parent,
+        default=_DEFAULT_MARKETPLACE,
         help="Path to marketplace root (default: parent of scripts/)",
     )
     parser.add_argument(
         "--output",
         type=Path,
-        default=Path(__file__).parent.parent / ".cursor" / "rules",
+        default=_DEFAULT_OUTPUT,
         help="Output directory for .mdc files (default: ./.cursor/rules)",
     )
     parser.add_argument(